@@ -0,0 +1,261 @@
+"""Latency/throughput benchmark for the API routers.
+
+Seed a database first, then drive it at a fixed concurrency and compare the JSON across commits:
+
+    python -m benchmarks.seed --database-url sqlite:///benchmarks/bench.db --scale 100000
+    python -m benchmarks.load --database-url sqlite:///benchmarks/bench.db --concurrency 16 --duration 30
+
+By default the app runs in-process over ASGI, so no server or network is needed. SQLite needs the aiosqlite
+driver for the async engine (`poetry install --with bench`). For Postgres, start
+`docker compose up -d luestilo_database` and pass its URL (the seeder applies the migrations). Use --base-url
+to target an already running server instead.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, datetime
+
+import httpx
+from sqlalchemy import create_engine, func, select
+
+from benchmarks.seed import BENCH_PASSWORD, BENCH_USERNAME, LAST_NAMES, SECOES
+from luestilo_api.models import Client, Order, Product
+
+ROUTERS = ('clients', 'products', 'orders', 'auth', 'messages')
+CREDENTIALS = {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}
+
+
+def valid_cpf(rng: random.Random) -> str:
+    digits = [rng.randint(0, 9) for _ in range(9)]
+    for length in (9, 10):
+        total = sum(digit * weight for digit, weight in zip(digits, range(length + 1, 1, -1)))
+        digits.append(total * 10 % 11 % 10)
+    return ''.join(map(str, digits))
+
+
+def build_scenarios(context: dict) -> dict:
+    def random_id(key):
+        return lambda rng: rng.randint(1, context[key])
+
+    client_id = random_id('max_client_id')
+    product_id = random_id('max_product_id')
+    order_id = random_id('max_order_id')
+
+    def new_client(rng):
+        # Not derived from the seed: reruns against the same database must not collide on CPF or email.
+        suffix = uuid.uuid4().hex[:12]
+        return {
+            'name': f'Cliente Benchmark {suffix}',
+            'cpf': valid_cpf(random.Random(suffix)),
+            'email': f'{suffix}@bench.luestilo.com.br',
+            'numero_whatsapp': '+5535991234567',
+            'aceita_notificacoes_whatsapp': True,
+        }
+
+    def new_order(rng):
+        items = {product_id(rng) for _ in range(rng.randint(1, 3))}
+        return {
+            'client_id': client_id(rng),
+            'status': 'pendente',
+            'periodo': date.today().isoformat(),
+            'items': [{'product_id': item, 'quantity': 1} for item in items],
+        }
+
+    # name: (router, weight, request builder returning method, path and httpx keyword arguments)
+    return {
+        'clients.list': ('clients', 6, lambda rng: ('GET', '/clients/', {'params': {'limit': 50}})),
+        'clients.search': (
+            'clients', 3, lambda rng: ('GET', '/clients/', {'params': {'name': rng.choice(LAST_NAMES), 'limit': 50}})
+        ),
+        'clients.detail': ('clients', 6, lambda rng: ('GET', f'/clients/{client_id(rng)}', {})),
+        'clients.create': ('clients', 1, lambda rng: ('POST', '/clients/', {'json': new_client(rng)})),
+        'products.list': (
+            'products',
+            8,
+            lambda rng: ('GET', '/products/', {'params': {'secao': rng.choice(list(SECOES)), 'limit': 50}}),
+        ),
+        'products.detail': ('products', 8, lambda rng: ('GET', f'/products/{product_id(rng)}', {})),
+        'orders.list': ('orders', 4, lambda rng: ('GET', '/orders/', {'params': {'limit': 50}})),
+        'orders.compact': ('orders', 2, lambda rng: ('GET', '/orders/', {'params': {'limit': 50, 'view': 'compact'}})),
+        'orders.by_total': (
+            'orders',
+            2,
+            lambda rng: ('GET', '/orders/', {'params': {'limit': 50, 'view': 'totals', 'sort': 'total_amount'}}),
+        ),
+        'orders.section': (
+            'orders', 2, lambda rng: ('GET', '/orders/', {'params': {'product_section': rng.choice(list(SECOES))}})
+        ),
+        'orders.detail': ('orders', 4, lambda rng: ('GET', f'/orders/{order_id(rng)}', {})),
+        'orders.create': ('orders', 2, lambda rng: ('POST', '/orders/', {'json': new_order(rng)})),
+        'auth.me': ('auth', 3, lambda rng: ('GET', '/users/me', {})),
+        'auth.token': ('auth', 1, lambda rng: ('POST', '/token', {'data': CREDENTIALS})),
+        'messages.send_to_client': (
+            'messages',
+            1,
+            lambda rng: (
+                'POST',
+                f'/send_to_client/{rng.choice(context["whatsapp_client_ids"])}',
+                {'json': {'mensagem': 'Promoção de benchmark'}},
+            ),
+        ),
+    }
+
+
+def load_context(database_url: str) -> dict:
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        context = {
+            'max_client_id': connection.scalar(select(func.max(Client.id))),
+            'max_product_id': connection.scalar(select(func.max(Product.id))),
+            'max_order_id': connection.scalar(select(func.max(Order.id))),
+            'whatsapp_client_ids': connection.scalars(
+                select(Client.id)
+                .where(Client.aceita_notificacoes_whatsapp == True, Client.numero_whatsapp.isnot(None))
+                .limit(1000)
+            ).all(),
+        }
+    engine.dispose()
+    if not context['max_order_id']:
+        raise SystemExit('Database is empty; run python -m benchmarks.seed first.')
+    return context
+
+
+def percentile(ordered: list[float], value: float) -> float:
+    return ordered[min(len(ordered) - 1, round(value / 100 * (len(ordered) - 1)))]
+
+
+def summarize(latencies: list[float], statuses: Counter, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if status >= 400)  # noqa: PLR2004
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput_rps': round(len(ordered) / elapsed, 2),
+        'p50_ms': round(percentile(ordered, 50) * 1000, 2) if ordered else None,
+        'p95_ms': round(percentile(ordered, 95) * 1000, 2) if ordered else None,
+        'p99_ms': round(percentile(ordered, 99) * 1000, 2) if ordered else None,
+        'status_codes': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+async def run_load(http: httpx.AsyncClient, scenarios: dict, args: argparse.Namespace) -> dict:
+    response = await http.post('/token', data=CREDENTIALS)
+    response.raise_for_status()
+    http.headers['Authorization'] = f'Bearer {response.json()["access_token"]}'
+
+    names = list(scenarios)
+    weights = [scenarios[name][1] for name in names]
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    started = time.perf_counter()
+    measure_from = started + args.warmup
+    deadline = measure_from + args.duration
+
+    async def worker(worker_id: int):
+        rng = random.Random(args.seed + worker_id)
+        while (now := time.perf_counter()) < deadline:
+            name = rng.choices(names, weights=weights)[0]
+            method, path, options = scenarios[name][2](rng)
+            response = await http.request(method, path, **options)
+            elapsed = time.perf_counter() - now
+            if now >= measure_from:
+                latencies[name].append(elapsed)
+                statuses[name][response.status_code] += 1
+
+    await asyncio.gather(*(worker(worker_id) for worker_id in range(args.concurrency)))
+
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    all_statuses = sum(statuses.values(), Counter())
+    return {
+        'scenarios': {name: summarize(latencies[name], statuses[name], args.duration) for name in sorted(latencies)},
+        'total': summarize(all_latencies, all_statuses, args.duration),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive the API routers and report latency percentiles as JSON.')
+    parser.add_argument('--database-url', default='sqlite:///benchmarks/bench.db')
+    parser.add_argument('--base-url', help='Benchmark a running server instead of the in-process app')
+    parser.add_argument('--routers', default=','.join(ROUTERS), help='Comma-separated subset of ' + ', '.join(ROUTERS))
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30.0, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=3.0, help='Seconds excluded from the results')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    routers = set(args.routers.split(','))
+    context = load_context(args.database_url)
+    scenarios = {name: scenario for name, scenario in build_scenarios(context).items() if scenario[0] in routers}
+
+    engines = []
+    if args.base_url:
+        transport = httpx.AsyncHTTPTransport()
+        base_url = args.base_url
+    else:
+        if args.database_url.startswith('sqlite') and importlib.util.find_spec('aiosqlite') is None:
+            raise SystemExit('SQLite runs need the aiosqlite driver: poetry install --with bench')
+        # The engines are created from Settings at import time, so the URL must be in place first.
+        os.environ['DATABASE_URL'] = args.database_url
+        from luestilo_api.app import app  # noqa: PLC0415
+        from luestilo_api.database import get_async_engine  # noqa: PLC0415
+        from luestilo_api.routers.messages import get_whatsapp_provider  # noqa: PLC0415
+        from luestilo_api.whatsapp import FakeWhatsAppProvider  # noqa: PLC0415
+
+        provider = FakeWhatsAppProvider()
+        app.dependency_overrides[get_whatsapp_provider] = lambda: provider
+        transport = httpx.ASGITransport(app=app)
+        base_url = 'http://benchmark'
+        engines.append(get_async_engine())
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as http:
+            results = await run_load(http, scenarios, args)
+        # aiosqlite connections live on non-daemon threads that would keep the interpreter from exiting.
+        for engine in engines:
+            await engine.dispose()
+        return results
+
+    results = asyncio.run(run())
+    with create_engine(args.database_url).connect() as connection:
+        dialect = connection.dialect.name
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'database': dialect,
+        'target': args.base_url or 'in-process',
+        'rows': {key: value for key, value in context.items() if key.startswith('max_')},
+        'concurrency': args.concurrency,
+        'duration_seconds': args.duration,
+        **results,
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+import argparse
+import itertools
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from alembic import command
+from alembic.config import Config
+from pwdlib import PasswordHash
+from sqlalchemy import create_engine, func, insert, select, text
+
+from luestilo_api.inventory import bucket_rows
+from luestilo_api.models import (
+    Client,
+    Order,
+    OrderProduct,
+    Product,
+    SalesDirtyDay,
+    StockBucket,
+    StockMovement,
+    User,
+    table_registry,
+)
+
+SECOES = {
+    'Vestuário Feminino': 35,
+    'Vestuário Masculino': 25,
+    'Vestuário Infantil': 12,
+    'Acessórios': 15,
+    'Calçados': 10,
+    'Cosméticos': 3,
+}
+PRODUCT_KINDS = ['Camiseta', 'Calça', 'Vestido', 'Blusa', 'Saia', 'Bermuda', 'Tênis', 'Bolsa', 'Cinto', 'Perfume']
+FIRST_NAMES = ['Maria', 'Ana', 'Júlia', 'João', 'José', 'Lucas', 'Pedro', 'Fernanda', 'Camila', 'Gabriel']
+LAST_NAMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Rodrigues', 'Almeida', 'Gomes']
+ORDER_STATUSES = {'entregue': 70, 'processando': 12, 'pendente': 10, 'cancelado': 8}
+# Retail seasonality: Black Friday and Christmas carry most of the year's volume.
+MONTH_WEIGHTS = [6, 5, 7, 7, 10, 8, 7, 8, 7, 8, 13, 14]
+
+BENCH_USERNAME = 'bench'
+BENCH_PASSWORD = 'bench-password'
+
+
+def scale_counts(scale: int) -> dict:
+    return {
+        'orders': scale,
+        'clients': max(scale // 10, 100),
+        'products': max(scale // 100, 50),
+    }
+
+
+def batched(rows, size: int):
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def period_days(years: int, today: date) -> tuple[list[date], list[int]]:
+    days = [today - timedelta(days=offset) for offset in range(365 * years)]
+    return days, [MONTH_WEIGHTS[day.month - 1] for day in days]
+
+
+def client_rows(rng: random.Random, count: int):
+    for client_id in range(1, count + 1):
+        has_whatsapp = rng.random() < 0.6  # noqa: PLR2004
+        yield {
+            'id': client_id,
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {client_id}',
+            'cpf': f'{client_id:011d}',
+            'email': f'cliente{client_id}@bench.luestilo.com.br',
+            'is_active': rng.random() < 0.97,  # noqa: PLR2004
+            'numero_whatsapp': f'+5535{client_id:09d}' if has_whatsapp else None,
+            'aceita_notificacoes_whatsapp': has_whatsapp and rng.random() < 0.5,  # noqa: PLR2004
+        }
+
+
+def product_rows(rng: random.Random, count: int):
+    for product_id in range(1, count + 1):
+        yield {
+            'id': product_id,
+            'descricao': f'{rng.choice(PRODUCT_KINDS)} {product_id}',
+            'valor_de_venda': round(min(max(rng.lognormvariate(4.3, 0.6), 9.9), 999.9), 2),
+            'codigo_de_barras': f'789{product_id:010d}',
+            'secao': weighted(rng, SECOES),
+            'estoque_inicial': 1_000_000,
+            'data_validade': None,
+            'imagens': [f'https://cdn.luestilo.com.br/produtos/{product_id}.jpg'],
+            'is_active': rng.random() < 0.95,  # noqa: PLR2004
+        }
+
+
+def zipf_weights(count: int, exponent: float) -> list[float]:
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+def order_rows(rng: random.Random, count: int, counts: dict, prices: list, years: int):
+    days, day_weights = period_days(years, date.today())
+    day_cumulative = list(itertools.accumulate(day_weights))
+    # A few best sellers and heavy buyers dominate, as in real catalogs.
+    product_ids = range(1, counts['products'] + 1)
+    product_cumulative = zipf_weights(counts['products'], 1.1)
+    client_ids = range(1, counts['clients'] + 1)
+    client_cumulative = zipf_weights(counts['clients'], 0.8)
+
+    for order_id in range(1, count + 1):
+        items = [
+            {
+                'order_id': order_id,
+                'product_id': product_id,
+                'quantity': rng.choices([1, 2, 3, 4], weights=[70, 20, 7, 3])[0],
+                'price_at_order': prices[product_id - 1],
+            }
+            for product_id in set(rng.choices(product_ids, cum_weights=product_cumulative, k=rng.randint(1, 4)))
+        ]
+        order = {
+            'id': order_id,
+            'status': weighted(rng, ORDER_STATUSES),
+            'periodo': rng.choices(days, cum_weights=day_cumulative)[0],
+            'client_id': rng.choices(client_ids, cum_weights=client_cumulative)[0],
+            'is_active': rng.random() < 0.98,  # noqa: PLR2004
+            'total_amount': round(sum(item['quantity'] * item['price_at_order'] for item in items), 2),
+            'item_count': sum(item['quantity'] for item in items),
+        }
+        yield order, items
+
+
+def prepare_schema(engine):
+    if engine.dialect.name == 'postgresql':
+        # Search relies on f_unaccent and the trigram/partial indexes, which only the migrations create.
+        command.upgrade(Config('alembic.ini'), 'head')
+    else:
+        table_registry.metadata.create_all(engine)
+
+
+def seed(engine, scale: int, years: int = 3, batch_size: int = 5000, seed_value: int = 42) -> dict:
+    rng = random.Random(seed_value)
+    counts = scale_counts(scale)
+    prepare_schema(engine)
+
+    with engine.begin() as connection:
+        if connection.scalar(select(func.count()).select_from(Order)):
+            raise SystemExit('Target database already has orders; seed an empty database.')
+        connection.execute(
+            insert(User).values(
+                username=BENCH_USERNAME,
+                email='bench@bench.luestilo.com.br',
+                password=PasswordHash.recommended().hash(BENCH_PASSWORD),
+            )
+        )
+
+    prices = []
+    with engine.begin() as connection:
+        for batch in batched(client_rows(rng, counts['clients']), batch_size):
+            connection.execute(insert(Client), batch)
+        for batch in batched(product_rows(rng, counts['products']), batch_size):
+            prices.extend(row['valor_de_venda'] for row in batch)
+            connection.execute(insert(Product), batch)
+            opening_stock = [
+                {'product_id': row['id'], 'quantity': row['estoque_inicial'], 'reason': 'initial', 'compacted': True}
+                for row in batch
+            ]
+            connection.execute(insert(StockMovement), opening_stock)
+            connection.execute(insert(StockBucket), bucket_rows({row['id']: row['estoque_inicial'] for row in batch}))
+
+    for batch in batched(order_rows(rng, counts['orders'], counts, prices, years), batch_size):
+        with engine.begin() as connection:
+            connection.execute(insert(Order), [order for order, _ in batch])
+            connection.execute(insert(OrderProduct), [item for _, items in batch for item in items])
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(SalesDirtyDay).from_select(['periodo'], select(Order.periodo).distinct())
+        )
+        if engine.dialect.name == 'postgresql':
+            for table in ('clients', 'products', 'orders'):
+                connection.execute(
+                    text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))")
+                )
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed synthetic clients, products and orders for benchmarks.')
+    parser.add_argument('--database-url', default='sqlite:///benchmarks/bench.db')
+    parser.add_argument('--scale', type=int, default=10_000, help='Number of orders (10k to 10M)')
+    parser.add_argument('--years', type=int, default=3, help='Spread of order periods, in years back from today')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # Alembic's env.py reads the URL from Settings.
+    os.environ['DATABASE_URL'] = args.database_url
+    engine = create_engine(args.database_url)
+
+    start = time.perf_counter()
+    counts = seed(engine, args.scale, years=args.years, batch_size=args.batch_size, seed_value=args.seed)
+    print(f'Seeded {counts} in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import json
+import timeit
+from datetime import date
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+
+from luestilo_api.responses import dump_json, type_adapter
+from luestilo_api.schemas import ClientList, OrderList
+
+SIZES = (100, 1000)
+REPEAT = 5
+
+
+def make_clients(count):
+    return [
+        SimpleNamespace(
+            id=i,
+            name=f'Cliente {i}',
+            cpf=f'{i:011d}',
+            email=f'cliente{i}@example.com',
+            is_active=True,
+            numero_whatsapp='+5535991234567',
+            aceita_notificacoes_whatsapp=i % 2 == 0,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_orders(count):
+    products = [
+        SimpleNamespace(
+            id=i,
+            descricao=f'Produto {i}',
+            valor_de_venda=59.99,
+            codigo_de_barras=f'789{i:010d}',
+            secao='Vestuário Feminino',
+            estoque_inicial=100,
+            data_validade=date(2025, 12, 31),
+            imagens=['http://example.com/img1.jpg'],
+            is_active=True,
+        )
+        for i in range(1, 4)
+    ]
+    items = [
+        SimpleNamespace(product_id=product.id, quantity=2, price_at_order=59.99, product=product)
+        for product in products
+    ]
+    return [
+        SimpleNamespace(
+            id=i,
+            status='processando',
+            periodo=date(2025, 5, 26),
+            client_id=i,
+            is_active=True,
+            total_amount=round(sum(item.quantity * item.price_at_order for item in items), 2),
+            item_count=sum(item.quantity for item in items),
+            products=items,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def fastapi_default(model, data):
+    # What the route did before: validate into the response model, turn it back into plain Python and let
+    # the JSON response class encode it.
+    adapter = type_adapter(model)
+    content = adapter.dump_python(adapter.validate_python(data, from_attributes=True), mode='json')
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def pre_serialized(model, data):
+    return dump_json(model, data)
+
+
+def bench(label, model, key, rows):
+    data = {key: rows, 'next_cursor': None}
+    assert json.loads(fastapi_default(model, data)) == json.loads(pre_serialized(model, data))
+
+    for name, fn in (('fastapi_default', fastapi_default), ('pre_serialized', pre_serialized)):
+        best = min(timeit.repeat(lambda: fn(model, data), number=1, repeat=REPEAT))
+        print(f'{label:<8} {len(rows):>5} rows  {name:<16} {best * 1000:8.2f} ms  {best / len(rows) * 1e6:8.2f} us/row')
+
+
+def main():
+    for size in SIZES:
+        bench('clients', ClientList, 'clients', make_clients(size))
+        bench('orders', OrderList, 'orders', make_orders(size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from luestilo_api.database import dialect_insert
+from luestilo_api.models import Order, OrderProduct, SalesDailyClient, SalesDailyProduct, SalesDirtyDay
+
+line_revenue = OrderProduct.quantity * OrderProduct.price_at_order
+
+
+# These are mapper events, so they only see ORM flushes. Bulk update()/delete() statements and Core inserts
+# against orders or order_products bypass them and must mark the affected days dirty themselves.
+@event.listens_for(Order, 'after_insert')
+@event.listens_for(Order, 'after_update')
+def mark_sales_day_dirty(mapper, connection, target):
+    mark_days_dirty(connection, {target.periodo, *inspect(target).attrs.periodo.history.deleted})
+
+
+@event.listens_for(OrderProduct, 'after_insert')
+@event.listens_for(OrderProduct, 'after_update')
+@event.listens_for(OrderProduct, 'after_delete')
+def mark_order_line_day_dirty(mapper, connection, target):
+    periodo = connection.scalar(select(Order.periodo).where(Order.id == target.order_id))
+    if periodo is not None:
+        mark_days_dirty(connection, {periodo})
+
+
+def mark_days_dirty(connection, days):
+    # Upserting (instead of DO NOTHING) makes us wait for a refresh that holds the day's row lock, so a day
+    # written while it was being rolled up is marked dirty again once that refresh commits.
+    statement = dialect_insert(connection, SalesDirtyDay)
+    connection.execute(
+        statement.on_conflict_do_update(index_elements=[SalesDirtyDay.periodo], set_={'marked_at': func.now()}),
+        [{'periodo': day} for day in days],
+    )
+
+
+def refresh_sales_rollups(session: Session) -> int:
+    days = session.scalars(
+        select(SalesDirtyDay.periodo).order_by(SalesDirtyDay.periodo).with_for_update(skip_locked=True)
+    ).all()
+    if not days:
+        session.rollback()
+        return 0
+
+    session.execute(delete(SalesDailyProduct).where(SalesDailyProduct.periodo.in_(days)))
+    session.execute(delete(SalesDailyClient).where(SalesDailyClient.periodo.in_(days)))
+
+    session.execute(
+        insert(SalesDailyProduct).from_select(
+            ['periodo', 'client_id', 'product_id', 'quantity', 'revenue'],
+            select(
+                Order.periodo,
+                Order.client_id,
+                OrderProduct.product_id,
+                func.sum(OrderProduct.quantity),
+                func.sum(line_revenue),
+            )
+            .join(Order.products)
+            .where(Order.is_active == True, Order.periodo.in_(days))
+            .group_by(Order.periodo, Order.client_id, OrderProduct.product_id),
+        )
+    )
+    session.execute(
+        insert(SalesDailyClient).from_select(
+            ['periodo', 'client_id', 'order_count', 'revenue'],
+            select(
+                Order.periodo,
+                Order.client_id,
+                func.count(func.distinct(Order.id)),
+                func.coalesce(func.sum(line_revenue), 0),
+            )
+            .outerjoin(Order.products)
+            .where(Order.is_active == True, Order.periodo.in_(days))
+            .group_by(Order.periodo, Order.client_id),
+        )
+    )
+
+    session.execute(delete(SalesDirtyDay).where(SalesDirtyDay.periodo.in_(days)))
+    session.commit()
+    return len(days)
@@ -2,16 +2,25 @@ from http import HTTPStatus
 
 from fastapi import FastAPI
 
-from luestilo_api.routers import auth, clients, orders, products, messages
+from luestilo_api.database import pin_reads_after_write
+from luestilo_api.instrumentation import instrument_request
+from luestilo_api.routers import analytics, auth, clients, exports, jobs, orders, products, messages, metrics
 from luestilo_api.schemas import Message
 
 app = FastAPI()
 
+app.middleware('http')(pin_reads_after_write)
+app.middleware('http')(instrument_request)
+
 app.include_router(clients.router)
 app.include_router(products.router)
 app.include_router(orders.router)
 app.include_router(auth.router)
 app.include_router(messages.router)
+app.include_router(metrics.router)
+app.include_router(exports.router)
+app.include_router(jobs.router)
+app.include_router(analytics.router)
 
 
 @app.get('/', status_code=HTTPStatus.OK, response_model=Message)
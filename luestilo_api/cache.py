@@ -0,0 +1,123 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate):
+        with self._lock:
+            stale_keys = [key for key, (value, _) in self._entries.items() if predicate(value)]
+            for key in stale_keys:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def incr(self, key: str) -> int: ...
+
+
+class MemoryCacheBackend:
+    def __init__(self, maxsize: int, ttl: float):
+        # Version counters share the bounded entry store. A counter is written after every entry it retires, with
+        # the longest TTL the store allows, so LRU eviction and expiry drop those entries before the counter.
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # One sequence for every counter: a counter that expired or was evicted never comes back with a value
+        # that older entries were stored under.
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.discard(key)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            version = next(self._versions)
+        self._entries.set(key, str(version).encode())
+        return version
+
+
+class RedisCacheBackend:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*keys)
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(key)
@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+from luestilo_api.cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from luestilo_api.search import strip_accents
+from luestilo_api.settings import Settings
+
+settings = Settings()
+
+LIST_VERSION_KEY = 'catalog:products:version'
+
+
+class CatalogCache:
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    def list_key(self, filters: dict) -> str:
+        if filters.get('secao'):
+            filters = {**filters, 'secao': strip_accents(filters['secao']).strip().lower()}
+        normalized = json.dumps(sorted((key, value) for key, value in filters.items() if value is not None))
+        version = int(self.backend.get(LIST_VERSION_KEY) or 0)
+        return f'catalog:products:list:{version}:{hashlib.sha1(normalized.encode()).hexdigest()}'
+
+    def product_key(self, product_id: int) -> str:
+        version = int(self.backend.get(self.product_version_key(product_id)) or 0)
+        return f'catalog:product:{product_id}:{version}'
+
+    @staticmethod
+    def product_version_key(product_id: int) -> str:
+        return f'catalog:product:{product_id}:version'
+
+    def get(self, key: str) -> tuple[str, bytes] | None:
+        cached = self.backend.get(key)
+        if cached is None:
+            return None
+        etag, _, body = cached.partition(b'\n')
+        return etag.decode(), body
+
+    def set(self, key: str, body: bytes) -> tuple[str, bytes]:
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.backend.set(key, etag.encode() + b'\n' + body, ttl=self.ttl)
+        return etag, body
+
+    def invalidate_products(self, product_ids) -> None:
+        # A product change can move it across any filter or page boundary, so every list page is retired
+        # by bumping the version embedded in list keys; detail keys carry a version per product. Readers build
+        # their key before querying, so a row loaded before the write is stored under a key nobody reads anymore.
+        for product_id in product_ids:
+            self.backend.incr(self.product_version_key(product_id))
+        self.backend.incr(LIST_VERSION_KEY)
+
+
+def build_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == 'redis':
+        import redis  # noqa: PLC0415 - optional dependency, only needed for the shared cache
+
+        return RedisCacheBackend(redis.Redis.from_url(settings.REDIS_URL))
+    return MemoryCacheBackend(maxsize=settings.CATALOG_CACHE_MAXSIZE, ttl=settings.CATALOG_CACHE_TTL_SECONDS)
+
+
+catalog_cache = CatalogCache(build_backend(), ttl=settings.CATALOG_CACHE_TTL_SECONDS)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix('W/') for candidate in if_none_match.split(',')}
+    return '*' in candidates or etag in candidates
+
+
+def cached_json_response(request: Request, etag: str, body: bytes) -> Response:
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    return Response(content=body, media_type='application/json', headers={'ETag': etag})
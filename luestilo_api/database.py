@@ -1,11 +1,251 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from functools import lru_cache
+
+from fastapi import Depends, Request
+from sqlalchemy import Connection, Engine, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
+from luestilo_api.metrics import Histogram, prometheus_histogram
 from luestilo_api.settings import Settings
 
-engine = create_engine(Settings().DATABASE_URL)
+settings = Settings()
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait = Histogram()
+        self.held = Histogram()
+        self._lock = threading.Lock()
+
+    def checked_out(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checked_out_at'] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+
+    def checked_in(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop('checked_out_at', None)
+        if checked_out_at is not None:
+            self.held.observe(time.perf_counter() - checked_out_at)
+
+    def connected(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def timed_out(self):
+        with self._lock:
+            self.timeouts += 1
+
+
+pool_metrics = {'sync': PoolMetrics(), 'async': PoolMetrics()}
+
+
+class TimedCheckoutMixin:
+    # Pool events only fire once a connection has been handed out, so the wait for one is timed around connect().
+    metrics: PoolMetrics | None = None
+
+    def connect(self):
+        if self.metrics is None:
+            return super().connect()
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.metrics.timed_out()
+            raise
+        finally:
+            self.metrics.wait.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(name: str, pool: Pool) -> Pool:
+    metrics = pool_metrics.setdefault(name, PoolMetrics())
+    pool.metrics = metrics
+    event.listen(pool, 'checkout', metrics.checked_out)
+    event.listen(pool, 'checkin', metrics.checked_in)
+    event.listen(pool, 'connect', metrics.connected)
+    return pool
+
+
+def pool_options(poolclass) -> dict:
+    if settings.DATABASE_URL.startswith('sqlite'):
+        return {}
+    return {
+        'poolclass': poolclass,
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+
+def async_database_url(url: str) -> str:
+    # psycopg 3 serves both engines from the same URL; SQLite needs the aiosqlite driver for the async one.
+    if url.startswith('sqlite://'):
+        return url.replace('sqlite://', 'sqlite+aiosqlite://', 1)
+    return url
+
+
+engine = create_engine(settings.DATABASE_URL, **pool_options(TimedQueuePool))
+instrument_pool('sync', engine.pool)
+
+
+@lru_cache
+def get_async_engine():
+    # Built on first use: with a SQLite URL the app must still import when aiosqlite is not installed.
+    async_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL), **pool_options(TimedAsyncQueuePool)
+    )
+    instrument_pool('async', async_engine.sync_engine.pool)
+    return async_engine
+
+
+class ReplicaPool:
+    def __init__(self, engines: list[Engine], retry_after: float):
+        self.engines = engines
+        self.retry_after = retry_after
+        self._down_until = [0.0] * len(engines)
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def candidates(self) -> list[Engine]:
+        # Round-robin start, skipping replicas whose connection failed until their retry time has passed.
+        start = next(self._next)
+        now = time.monotonic()
+        with self._lock:
+            indexes = [(start + offset) % len(self.engines) for offset in range(len(self.engines))]
+            return [self.engines[index] for index in indexes if self._down_until[index] <= now]
+
+    def mark_down(self, engine: Engine):
+        with self._lock:
+            self._down_until[self.engines.index(engine)] = time.monotonic() + self.retry_after
+
+
+replica_pool = ReplicaPool(
+    [create_engine(url, **pool_options(TimedQueuePool)) for url in settings.DATABASE_REPLICA_URLS],
+    retry_after=settings.REPLICA_RETRY_SECONDS,
+)
+for index, replica in enumerate(replica_pool.engines):
+    instrument_pool(f'replica-{index}', replica.pool)
+
+
+def pool_stats() -> dict:
+    stats = {}
+    # The async engine is only reported once something has used it.
+    async_pool = get_async_engine().pool if get_async_engine.cache_info().currsize else None
+    pools = [('sync', engine.pool), ('async', async_pool)]
+    pools.extend((f'replica-{index}', replica.pool) for index, replica in enumerate(replica_pool.engines))
+    for name, pool in pools:
+        metrics = pool_metrics.setdefault(name, PoolMetrics())
+        is_queue_pool = isinstance(pool, QueuePool)
+        stats[name] = {
+            'size': pool.size() if is_queue_pool else 0,
+            'checked_out': pool.checkedout() if is_queue_pool else 0,
+            'overflow': max(pool.overflow(), 0) if is_queue_pool else 0,
+            'checkouts': metrics.checkouts,
+            'connects': metrics.connects,
+            'timeouts': metrics.timeouts,
+            'wait': metrics.wait.snapshot(),
+            'held': metrics.held.snapshot(),
+        }
+    return stats
+
+
+def render_pool_metrics() -> str:
+    pools = list(pool_metrics.items())
+    lines = [
+        *prometheus_histogram(
+            'luestilo_pool_wait_seconds',
+            'Time spent waiting for a pooled connection.',
+            [({'pool': name}, metrics.wait) for name, metrics in pools],
+        ),
+        '# HELP luestilo_pool_timeouts_total Checkouts that gave up waiting for a pooled connection.',
+        '# TYPE luestilo_pool_timeouts_total counter',
+        *(f'luestilo_pool_timeouts_total{{pool="{name}"}} {metrics.timeouts}' for name, metrics in pools),
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def dialect_insert(bind: Session | Connection, model):
+    if isinstance(bind, Session):
+        bind = bind.get_bind()
+    if bind.dialect.name == 'postgresql':
+        return postgresql.insert(model)
+    return sqlite.insert(model)
 
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+READ_PRIMARY_COOKIE = 'read_primary_until'
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_session(request: Request, session: Session = Depends(get_session)):
+    if not replica_pool.engines or reads_pinned_to_primary(request):
+        yield session
+        return
+
+    # Pinging checks a connection out before the handler runs, so an unreachable replica is taken out of rotation
+    # for REPLICA_RETRY_SECONDS and the read moves on to the next candidate, then to the primary.
+    for replica in replica_pool.candidates():
+        replica_session = Session(replica)
+        try:
+            replica_session.connection()
+        except OperationalError:
+            replica_session.close()
+            replica_pool.mark_down(replica)
+            continue
+        with replica_session:
+            try:
+                yield replica_session
+            except OperationalError:
+                replica_pool.mark_down(replica)
+                raise
+        return
+
+    yield session
+
+
+async def pin_reads_after_write(request: Request, call_next):
+    response = await call_next(request)
+    # Replicas lag behind the primary, so a client's own reads stay there for a while after it writes.
+    if replica_pool.engines and request.method not in {'GET', 'HEAD', 'OPTIONS'} and response.status_code < 400:  # noqa: PLR2004
+        window = settings.READ_YOUR_WRITES_SECONDS
+        response.set_cookie(READ_PRIMARY_COOKIE, str(time.time() + window), max_age=window, httponly=True)
+    return response
+
+
+async def get_async_session():
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,50 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from luestilo_api.metrics import Histogram
+
+
+class HashingPool:
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.rejected = 0
+        self.latency = {'hash': Histogram(), 'verify': Histogram()}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='argon2')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+
+    def run(self, operation: str, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Password hashing is saturated, try again shortly',
+                headers={'Retry-After': '1'},
+            )
+
+        with self._lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self.latency[operation].observe(time.perf_counter() - start)
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'in_flight': self.in_flight,
+            'rejected': self.rejected,
+            'latency': {operation: histogram.snapshot() for operation, histogram in self.latency.items()},
+        }
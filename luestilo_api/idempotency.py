@@ -0,0 +1,96 @@
+import hashlib
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from luestilo_api.database import dialect_insert
+from luestilo_api.models import IdempotencyKey
+from luestilo_api.settings import Settings
+
+settings = Settings()
+
+
+def utcnow() -> datetime:
+    return datetime.now(tz=ZoneInfo('UTC')).replace(tzinfo=None)
+
+
+def fingerprint(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+def find_key(session: Session, user_id: int, scope: str, key: str, now: datetime):
+    return session.scalar(
+        select(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > now,
+        )
+    )
+
+
+def claim_idempotency_key(session: Session, user_id: int, scope: str, key: str | None, payload: BaseModel):
+    if key is None:
+        return None
+
+    digest = fingerprint(payload)
+    now = utcnow()
+    stored = find_key(session, user_id, scope, key, now)
+
+    if stored is None:
+        # The key row is written in the caller's transaction, so a concurrent duplicate blocks on this insert
+        # until the first request commits (and then replays it) or rolls back (and then runs it itself).
+        values = {'fingerprint': digest, 'expires_at': now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)}
+        statement = dialect_insert(session, IdempotencyKey).values(user_id=user_id, scope=scope, key=key, **values)
+        claimed = session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[IdempotencyKey.user_id, IdempotencyKey.scope, IdempotencyKey.key],
+                set_={**values, 'response_status': None, 'response_body': None},
+                where=IdempotencyKey.expires_at <= now,
+            ).returning(IdempotencyKey.key)
+        ).first()
+        if claimed:
+            return None
+        stored = find_key(session, user_id, scope, key, now)
+
+    if stored.fingerprint != digest:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail='Idempotency-Key already used with a different request body',
+        )
+
+    return Response(
+        content=stored.response_body,
+        status_code=stored.response_status,
+        media_type='application/json',
+        headers={'Idempotent-Replayed': 'true'},
+    )
+
+
+def complete_idempotency_key(
+    session: Session, user_id: int, scope: str, key: str | None, status_code: int, body: bytes
+):
+    if key is None:
+        return
+    session.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > utcnow(),
+        )
+        .values(response_status=status_code, response_body=body)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def purge_expired_idempotency_keys(session: Session) -> int:
+    purged = session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= utcnow()))
+    session.commit()
+    return purged.rowcount
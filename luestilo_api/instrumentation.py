@@ -0,0 +1,121 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from luestilo_api.metrics import Histogram, prometheus_histogram
+
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+ROW_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+        self.db_time = 0.0
+        self.spans: dict[str, float] = {}
+
+
+current_request_stats: ContextVar[RequestStats | None] = ContextVar('current_request_stats', default=None)
+
+
+@contextmanager
+def timed(span: str):
+    stats = current_request_stats.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.spans[span] = stats.spans.get(span, 0.0) + time.perf_counter() - start
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if current_request_stats.get() is not None:
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    if stats is None or not conn.info.get('query_start'):
+        return
+    stats.db_time += time.perf_counter() - conn.info['query_start'].pop()
+    stats.queries += 1
+    # psycopg reports the rows a SELECT returned; SQLite only reports rows touched by DML.
+    if cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+class RouteMetrics:
+    def __init__(self):
+        self._routes: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, duration: float, stats: RequestStats):
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[method, route] = {
+                    'duration': Histogram(),
+                    'db': Histogram(),
+                    'queries': Histogram(QUERY_BUCKETS),
+                    'rows': Histogram(ROW_BUCKETS),
+                }
+            metrics['duration'].observe(duration)
+            metrics['db'].observe(stats.db_time)
+            metrics['queries'].observe(stats.queries)
+            metrics['rows'].observe(stats.rows)
+
+    def render(self) -> str:
+        with self._lock:
+            routes = dict(self._routes)
+
+        def series(name):
+            return [({'method': method, 'route': route}, metrics[name]) for (method, route), metrics in routes.items()]
+
+        lines = [
+            *prometheus_histogram(
+                'luestilo_request_duration_seconds', 'Wall time per request.', series('duration')
+            ),
+            *prometheus_histogram('luestilo_request_db_seconds', 'Time spent in SQL per request.', series('db')),
+            *prometheus_histogram(
+                'luestilo_request_queries', 'SQL statements executed per request.', series('queries')
+            ),
+            *prometheus_histogram('luestilo_request_rows', 'Rows returned or affected per request.', series('rows')),
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+route_metrics = RouteMetrics()
+
+
+def server_timing(duration: float, stats: RequestStats) -> str:
+    entries = [
+        f'app;dur={duration * 1000:.1f}',
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries, {stats.rows} rows"',
+    ]
+    entries.extend(f'{span};dur={elapsed * 1000:.1f}' for span, elapsed in stats.spans.items())
+    return ', '.join(entries)
+
+
+async def instrument_request(request: Request, call_next):
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_stats.reset(token)
+    duration = time.perf_counter() - start
+
+    route = request.scope.get('route')
+    route_metrics.observe(request.method, route.path if route else 'unmatched', duration, stats)
+    response.headers['Server-Timing'] = server_timing(duration, stats)
+    return response
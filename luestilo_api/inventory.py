@@ -0,0 +1,214 @@
+import random
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import bindparam, case, delete, event, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from luestilo_api.models import Product, StockBucket, StockMovement
+
+# Available stock is split across a few rows per product. An order decrements a single random bucket with a
+# conditional UPDATE, so concurrent checkouts of a hot SKU mostly touch different rows instead of queueing on one
+# lock, and the CHECK constraint on the buckets makes overselling impossible on every dialect.
+STOCK_BUCKETS = 8
+
+
+def split_stock(quantity: int) -> list[int]:
+    quantity = max(quantity, 0)
+    return [quantity // STOCK_BUCKETS + (bucket < quantity % STOCK_BUCKETS) for bucket in range(STOCK_BUCKETS)]
+
+
+def bucket_rows(quantities: dict[int, int]) -> list[dict]:
+    return [
+        {'product_id': product_id, 'bucket': bucket, 'available': available}
+        for product_id, quantity in sorted(quantities.items())
+        for bucket, available in enumerate(split_stock(quantity))
+    ]
+
+
+def opening_movements(quantities: dict[int, int]) -> list[dict]:
+    return [
+        {'product_id': product_id, 'quantity': quantity, 'reason': 'initial', 'compacted': True}
+        for product_id, quantity in quantities.items()
+    ]
+
+
+@event.listens_for(Product, 'after_insert')
+def open_product_stock(mapper, connection, target):
+    quantities = {target.id: target.estoque_inicial}
+    connection.execute(insert(StockBucket), bucket_rows(quantities))
+    connection.execute(insert(StockMovement), opening_movements(quantities))
+
+
+def open_stock(session: Session, quantities: dict[int, int]):
+    # For products inserted with Core statements, which skip the mapper event above.
+    if quantities:
+        session.execute(insert(StockBucket), bucket_rows(quantities))
+        record_movements(session, opening_movements(quantities))
+
+
+def reserve_stock(session: Session, quantities: dict[int, int]) -> dict[int, int]:
+    # Returns the available stock of every product that falls short; nothing is reserved for those.
+    if not quantities:
+        return {}
+    # Every bucket lock is taken in (product_id, bucket) order, so overlapping orders cannot deadlock. The fast
+    # path runs in a savepoint: when a picked bucket runs low, rolling it back releases its locks before the
+    # fallback locks whole products, instead of holding one product's bucket while waiting on another's.
+    savepoint = session.begin_nested()
+    reserved = take_picked_buckets(session, quantities)
+    if len(reserved) == len(quantities):
+        savepoint.commit()
+        return {}
+    savepoint.rollback()
+    return take_across_buckets(session, quantities)
+
+
+def take_picked_buckets(session: Session, quantities: dict[int, int]) -> set[int]:
+    requested = case(quantities, value=StockBucket.product_id)
+    picked = {product_id: random.randrange(STOCK_BUCKETS) for product_id in quantities}
+    locked = (
+        select(StockBucket.product_id, StockBucket.bucket)
+        .where(tuple_(StockBucket.product_id, StockBucket.bucket).in_(list(picked.items())))
+        .order_by(StockBucket.product_id, StockBucket.bucket)
+        .with_for_update()
+    )
+    return set(
+        session.scalars(
+            update(StockBucket)
+            .where(
+                tuple_(StockBucket.product_id, StockBucket.bucket).in_(locked),
+                StockBucket.available >= requested,
+            )
+            .values(available=StockBucket.available - requested)
+            .returning(StockBucket.product_id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+
+
+def take_across_buckets(session: Session, quantities: dict[int, int]) -> dict[int, int]:
+    # Lock all buckets of every requested product and take each quantity across them.
+    buckets = session.execute(
+        select(StockBucket.product_id, StockBucket.bucket, StockBucket.available)
+        .where(StockBucket.product_id.in_(quantities))
+        .order_by(StockBucket.product_id, StockBucket.bucket)
+        .with_for_update()
+    ).all()
+    available = Counter()
+    for product_id, _, quantity in buckets:
+        available[product_id] += quantity
+    shortfalls = {
+        product_id: available[product_id]
+        for product_id, quantity in quantities.items()
+        if available[product_id] < quantity
+    }
+    if shortfalls:
+        return shortfalls
+
+    remaining = dict(quantities)
+    taken = []
+    for product_id, bucket, quantity in buckets:
+        take = min(quantity, remaining[product_id])
+        if take:
+            remaining[product_id] -= take
+            taken.append({'product_id': product_id, 'bucket': bucket, 'available': quantity - take})
+    session.execute(update(StockBucket), taken)
+    return {}
+
+
+def add_stock(session: Session, quantities: dict[int, int], reason: str = 'restock'):
+    if not quantities:
+        return
+    buckets = StockBucket.__table__
+    # A Core statement: an executemany of the ORM entity would be treated as a bulk UPDATE by primary key.
+    session.execute(
+        update(buckets)
+        .where(buckets.c.product_id == bindparam('target_product'), buckets.c.bucket == bindparam('target_bucket'))
+        .values(available=buckets.c.available + bindparam('delta')),
+        [
+            {'target_product': row['product_id'], 'target_bucket': row['bucket'], 'delta': row['available']}
+            for row in bucket_rows(quantities)
+            if row['available']
+        ],
+    )
+    record_movements(
+        session,
+        [
+            {'product_id': product_id, 'quantity': quantity, 'reason': reason}
+            for product_id, quantity in quantities.items()
+        ],
+    )
+
+
+def record_movements(session: Session, movements: list[dict]):
+    if movements:
+        session.execute(insert(StockMovement), movements)
+
+
+def set_stock(session: Session, quantities: dict[int, int], reason: str = 'adjustment'):
+    if not quantities:
+        return
+    # Locking the buckets waits for in-flight reservations, so the balance read next includes them.
+    session.execute(
+        select(StockBucket.product_id)
+        .where(StockBucket.product_id.in_(quantities))
+        .order_by(StockBucket.product_id, StockBucket.bucket)
+        .with_for_update()
+    ).all()
+    current = dict(session.execute(select(Product.id, Product.estoque).where(Product.id.in_(quantities))).all())
+
+    session.execute(delete(StockBucket).where(StockBucket.product_id.in_(quantities)))
+    session.execute(insert(StockBucket), bucket_rows(quantities))
+    session.execute(
+        update(StockMovement)
+        .where(StockMovement.product_id.in_(quantities), StockMovement.compacted == False)
+        .values(compacted=True)
+        .execution_options(synchronize_session=False)
+    )
+    session.execute(
+        update(Product)
+        .where(Product.id.in_(quantities))
+        .values(estoque_inicial=case(quantities, value=Product.id))
+        .execution_options(synchronize_session=False)
+    )
+    record_movements(
+        session,
+        [
+            {'product_id': product_id, 'quantity': quantity - current[product_id], 'reason': reason, 'compacted': True}
+            for product_id, quantity in quantities.items()
+            if quantity != current[product_id]
+        ],
+    )
+
+
+def compact_stock_movements(session: Session) -> int:
+    folded = session.execute(
+        update(StockMovement)
+        .where(StockMovement.compacted == False)
+        .values(compacted=True)
+        .returning(StockMovement.product_id, StockMovement.quantity)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    deltas = Counter()
+    for product_id, quantity in folded:
+        deltas[product_id] += quantity
+    deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+
+    if deltas:
+        session.execute(
+            update(Product)
+            .where(Product.id.in_(deltas))
+            .values(estoque_inicial=Product.estoque_inicial + case(deltas, value=Product.id))
+            .execution_options(synchronize_session=False)
+        )
+    session.commit()
+    return len(folded)
+
+
+def stock_at(session: Session, product_id: int, moment: datetime) -> int:
+    return session.scalar(
+        select(func.coalesce(func.sum(StockMovement.quantity), 0)).where(
+            StockMovement.product_id == product_id, StockMovement.created_at <= moment
+        )
+    )
@@ -0,0 +1,43 @@
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.count = 0
+        self.sum = 0.0
+        self._counts = [0] * len(self.buckets)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    self._counts[index] += 1
+                    break
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for upper_bound, bucket_count in zip(self.buckets, self._counts):
+                cumulative += bucket_count
+                buckets[str(upper_bound)] = cumulative
+            buckets['+Inf'] = self.count
+            return {'buckets': buckets, 'count': self.count, 'sum': self.sum}
+
+
+def prometheus_histogram(name: str, description: str, series: list[tuple[dict, Histogram]]) -> list[str]:
+    lines = [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+    for labels, histogram in series:
+        snapshot = histogram.snapshot()
+        label_text = ','.join(f'{key}="{value}"' for key, value in labels.items())
+        for upper_bound, count in snapshot['buckets'].items():
+            lines.append(f'{name}_bucket{{{label_text},le="{upper_bound}"}} {count}')
+        lines.append(f'{name}_sum{{{label_text}}} {snapshot["sum"]}')
+        lines.append(f'{name}_count{{{label_text}}} {snapshot["count"]}')
+    return lines
@@ -1,14 +1,23 @@
 import json
-from datetime import date
+from datetime import date, datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, String, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
+from sqlalchemy import Boolean, CheckConstraint, ForeignKey, Index, LargeBinary, String, func, select, text
+from sqlalchemy.orm import Mapped, column_property, mapped_column, registry, relationship
 from sqlalchemy.types import Text, TypeDecorator
 
 table_registry = registry()
 
 
+def active_index(name: str, *columns: str) -> Index:
+    return Index(
+        name,
+        *columns,
+        postgresql_where=text('is_active'),
+        sqlite_where=text('is_active = 1'),
+    )
+
+
 class JSONList(TypeDecorator):
     impl = Text
     cache_ok = True
@@ -27,12 +36,14 @@ class JSONList(TypeDecorator):
 @table_registry.mapped_as_dataclass
 class Client:
     __tablename__ = 'clients'
+    __table_args__ = (active_index('ix_clients_active_id', 'id'),)
+
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     name: Mapped[str]
     cpf: Mapped[str] = mapped_column(unique=True)
     email: Mapped[str] = mapped_column(unique=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    numero_whatsapp: Mapped[Optional[str]] = mapped_column(String(20), nullable=True, default=None) 
+    numero_whatsapp: Mapped[Optional[str]] = mapped_column(String(20), nullable=True, default=None)
     aceita_notificacoes_whatsapp: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     orders: Mapped[List['Order']] = relationship(
         back_populates='client',
@@ -44,6 +55,11 @@ class Client:
 @table_registry.mapped_as_dataclass
 class Product:
     __tablename__ = 'products'
+    __table_args__ = (
+        active_index('ix_products_active_id', 'id'),
+        active_index('ix_products_active_secao_valor', 'secao', 'valor_de_venda'),
+    )
+
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     descricao: Mapped[str]
     valor_de_venda: Mapped[float]
@@ -63,11 +79,21 @@ class Product:
 @table_registry.mapped_as_dataclass
 class Order:
     __tablename__ = 'orders'
+    __table_args__ = (
+        active_index('ix_orders_active_id', 'id'),
+        active_index('ix_orders_active_client_periodo', 'client_id', 'periodo'),
+        active_index('ix_orders_active_periodo', 'periodo'),
+        active_index('ix_orders_active_total_amount', 'total_amount', 'id'),
+    )
+
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     status: Mapped[str]
     periodo: Mapped[date]
     client_id: Mapped[int] = mapped_column(ForeignKey('clients.id'))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Denormalized from the items when the order is created, so listings never need to join them.
+    total_amount: Mapped[float] = mapped_column(default=0, server_default='0')
+    item_count: Mapped[int] = mapped_column(default=0, server_default='0')
 
     client: Mapped['Client'] = relationship(
         back_populates='orders',
@@ -83,6 +109,8 @@ class Order:
 @table_registry.mapped_as_dataclass
 class OrderProduct:
     __tablename__ = 'order_products'
+    __table_args__ = (Index('ix_order_products_product_id', 'product_id'),)
+
     order_id: Mapped[int] = mapped_column(ForeignKey('orders.id'), primary_key=True)
     product_id: Mapped[int] = mapped_column(ForeignKey('products.id'), primary_key=True)
     quantity: Mapped[int]
@@ -92,6 +120,64 @@ class OrderProduct:
     product: Mapped['Product'] = relationship(back_populates='order_items', init=False)
 
 
+@table_registry.mapped_as_dataclass
+class StockMovement:
+    __tablename__ = 'stock_movements'
+    __table_args__ = (
+        Index('ix_stock_movements_product_created', 'product_id', 'created_at'),
+        Index(
+            'ix_stock_movements_uncompacted',
+            'product_id',
+            postgresql_where=text('NOT compacted'),
+            sqlite_where=text('compacted = 0'),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey('products.id'))
+    quantity: Mapped[int]
+    reason: Mapped[str] = mapped_column(String(20))
+    order_id: Mapped[Optional[int]] = mapped_column(ForeignKey('orders.id'), default=None)
+    compacted: Mapped[bool] = mapped_column(Boolean, default=False, server_default=text('false'))
+    created_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
+
+
+@table_registry.mapped_as_dataclass
+class StockBucket:
+    __tablename__ = 'stock_buckets'
+    __table_args__ = (CheckConstraint('available >= 0', name='ck_stock_buckets_available'),)
+
+    product_id: Mapped[int] = mapped_column(ForeignKey('products.id'), primary_key=True)
+    bucket: Mapped[int] = mapped_column(primary_key=True)
+    available: Mapped[int]
+
+
+# products.estoque_inicial only holds the balance as of the last compaction; the live stock adds the
+# movements appended since then, so reservations never have to rewrite the product row.
+Product.__mapper__.add_property(
+    'estoque',
+    column_property(
+        Product.__table__.c.estoque_inicial
+        + select(func.coalesce(func.sum(StockMovement.quantity), 0))
+        .where(StockMovement.product_id == Product.__table__.c.id, StockMovement.compacted == False)
+        .correlate_except(StockMovement)
+        .scalar_subquery()
+    ),
+)
+
+
+def trigram_index(name: str, expression) -> Index:
+    # pg_trgm and f_unaccent come from migration 3b7e2f9a1c4d; declared here so autogenerate keeps the indexes.
+    return Index(
+        name, expression.label(name), postgresql_using='gin', postgresql_ops={name: 'gin_trgm_ops'}
+    ).ddl_if(dialect='postgresql')
+
+
+trigram_index('ix_clients_name_trgm', func.f_unaccent(Client.__table__.c.name))
+trigram_index('ix_clients_email_trgm', Client.__table__.c.email)
+trigram_index('ix_products_secao_trgm', func.f_unaccent(Product.__table__.c.secao))
+
+
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
@@ -101,3 +187,83 @@ class User:
     password: Mapped[str]
     email: Mapped[str] = mapped_column(unique=True)
 
+
+@table_registry.mapped_as_dataclass
+class BroadcastJob:
+    __tablename__ = 'broadcast_jobs'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    mensagem: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
+
+
+@table_registry.mapped_as_dataclass
+class BroadcastRecipient:
+    __tablename__ = 'broadcast_recipients'
+    __table_args__ = (
+        Index('ix_broadcast_recipients_job_status', 'job_id', 'status'),
+        Index(
+            'ix_broadcast_recipients_pending',
+            'id',
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        Index(
+            'ix_broadcast_recipients_sending',
+            'claimed_at',
+            postgresql_where=text("status = 'sending'"),
+            sqlite_where=text("status = 'sending'"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    job_id: Mapped[int] = mapped_column(ForeignKey('broadcast_jobs.id'))
+    client_id: Mapped[int] = mapped_column(ForeignKey('clients.id'))
+    numero_whatsapp: Mapped[str] = mapped_column(String(20))
+    status: Mapped[str] = mapped_column(String(10), default='pending', server_default='pending')
+    attempts: Mapped[int] = mapped_column(default=0, server_default='0')
+    error: Mapped[Optional[str]] = mapped_column(default=None)
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(default=None)
+
+
+@table_registry.mapped_as_dataclass
+class SalesDailyProduct:
+    __tablename__ = 'sales_daily_products'
+
+    periodo: Mapped[date] = mapped_column(primary_key=True)
+    client_id: Mapped[int] = mapped_column(ForeignKey('clients.id'), primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey('products.id'), primary_key=True)
+    quantity: Mapped[int]
+    revenue: Mapped[float]
+
+
+@table_registry.mapped_as_dataclass
+class SalesDailyClient:
+    __tablename__ = 'sales_daily_clients'
+
+    periodo: Mapped[date] = mapped_column(primary_key=True)
+    client_id: Mapped[int] = mapped_column(ForeignKey('clients.id'), primary_key=True)
+    order_count: Mapped[int]
+    revenue: Mapped[float]
+
+
+@table_registry.mapped_as_dataclass
+class SalesDirtyDay:
+    __tablename__ = 'sales_dirty_days'
+
+    periodo: Mapped[date] = mapped_column(primary_key=True)
+    marked_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
+
+
+@table_registry.mapped_as_dataclass
+class IdempotencyKey:
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (Index('ix_idempotency_keys_expires_at', 'expires_at'),)
+
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), primary_key=True)
+    scope: Mapped[str] = mapped_column(String(20), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    expires_at: Mapped[datetime]
+    response_status: Mapped[Optional[int]] = mapped_column(default=None)
+    response_body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, default=None)
@@ -0,0 +1,43 @@
+import base64
+import binascii
+import json
+from datetime import date
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, date) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [
+            date.fromisoformat(value) if column.type.python_type is date else column.type.python_type(value)
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor')
+
+
+def paginate(query, columns: list, skip: int, limit: int, after: str | None = None):
+    query = query.order_by(*columns)
+
+    if after:
+        query = query.where(tuple_(*columns) > tuple_(*decode_cursor(after, columns)))
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit)
+
+
+def next_cursor(rows: list, columns: list, limit: int) -> str | None:
+    if not rows or len(rows) < limit:
+        return None
+    return encode_cursor([getattr(rows[-1], column.key) for column in columns])
@@ -0,0 +1,24 @@
+from functools import lru_cache
+from http import HTTPStatus
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from luestilo_api.instrumentation import timed
+
+
+@lru_cache
+def type_adapter(model) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def dump_json(model, data) -> bytes:
+    adapter = type_adapter(model)
+    with timed('serialize'):
+        return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def model_response(model, data, status_code: int = HTTPStatus.OK) -> Response:
+    # Validating once and letting pydantic-core write the bytes skips FastAPI's second validation pass
+    # and the intermediate dict tree it hands to json.dumps.
+    return Response(content=dump_json(model, data), media_type='application/json', status_code=status_code)
@@ -0,0 +1,126 @@
+from datetime import date
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import extract, func, select
+from sqlalchemy.orm import Session
+
+from luestilo_api.analytics import refresh_sales_rollups
+from luestilo_api.database import get_read_session, get_session
+from luestilo_api.models import Client, Product, SalesDailyClient, SalesDailyProduct
+from luestilo_api.schemas import AverageTicket, CurrentUser, RevenueReport, RollupRefresh, TopProductList
+from luestilo_api.security import get_current_user
+
+router = APIRouter(prefix='/analytics', tags=['analytics'])
+
+
+def in_period(query, model, start_periodo: Optional[date], end_periodo: Optional[date], client_id: Optional[int]):
+    if start_periodo:
+        query = query.where(model.periodo >= start_periodo)
+    if end_periodo:
+        query = query.where(model.periodo <= end_periodo)
+    if client_id is not None:
+        query = query.where(model.client_id == client_id)
+    return query
+
+
+@router.get('/revenue', status_code=HTTPStatus.OK, response_model=RevenueReport)
+def read_revenue(
+    group_by: str = Query('month', pattern='^(day|month|year|secao|client)$'),
+    start_periodo: Optional[date] = Query(None),
+    end_periodo: Optional[date] = Query(None),
+    client_id: Optional[int] = Query(None),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    year = extract('year', SalesDailyProduct.periodo)
+    month = extract('month', SalesDailyProduct.periodo)
+    keys = {
+        'day': [SalesDailyProduct.periodo],
+        'month': [year, month],
+        'year': [year],
+        'secao': [Product.secao],
+        'client': [SalesDailyProduct.client_id, Client.name],
+    }[group_by]
+
+    query = select(
+        *keys, func.sum(SalesDailyProduct.quantity), func.sum(SalesDailyProduct.revenue)
+    ).group_by(*keys).order_by(*keys)
+    if group_by == 'secao':
+        query = query.join(Product, Product.id == SalesDailyProduct.product_id)
+    elif group_by == 'client':
+        query = query.join(Client, Client.id == SalesDailyProduct.client_id)
+    query = in_period(query, SalesDailyProduct, start_periodo, end_periodo, client_id)
+
+    buckets = []
+    for *key, quantity, revenue in session.execute(query):
+        label = None
+        if group_by == 'day':
+            bucket_key = key[0].isoformat()
+        elif group_by == 'month':
+            bucket_key = f'{int(key[0]):04d}-{int(key[1]):02d}'
+        elif group_by == 'year':
+            bucket_key = f'{int(key[0]):04d}'
+        elif group_by == 'client':
+            bucket_key, label = str(key[0]), key[1]
+        else:
+            bucket_key = key[0]
+        buckets.append({'key': bucket_key, 'label': label, 'quantity': quantity, 'revenue': round(revenue, 2)})
+
+    return {'group_by': group_by, 'buckets': buckets}
+
+
+@router.get('/top-products', status_code=HTTPStatus.OK, response_model=TopProductList)
+def read_top_products(
+    limit: int = Query(10, ge=1, le=100),
+    order_by: str = Query('revenue', pattern='^(revenue|quantity)$'),
+    start_periodo: Optional[date] = Query(None),
+    end_periodo: Optional[date] = Query(None),
+    client_id: Optional[int] = Query(None),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    quantity = func.sum(SalesDailyProduct.quantity).label('quantity')
+    revenue = func.sum(SalesDailyProduct.revenue).label('revenue')
+    query = (
+        select(Product.id.label('product_id'), Product.descricao, Product.secao, quantity, revenue)
+        .join(Product, Product.id == SalesDailyProduct.product_id)
+        .group_by(Product.id, Product.descricao, Product.secao)
+        .order_by((revenue if order_by == 'revenue' else quantity).desc(), Product.id)
+        .limit(limit)
+    )
+    query = in_period(query, SalesDailyProduct, start_periodo, end_periodo, client_id)
+
+    return {'products': session.execute(query).mappings().all()}
+
+
+@router.get('/average-ticket', status_code=HTTPStatus.OK, response_model=AverageTicket)
+def read_average_ticket(
+    start_periodo: Optional[date] = Query(None),
+    end_periodo: Optional[date] = Query(None),
+    client_id: Optional[int] = Query(None),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    query = select(
+        func.coalesce(func.sum(SalesDailyClient.order_count), 0),
+        func.coalesce(func.sum(SalesDailyClient.revenue), 0),
+    )
+    order_count, revenue = session.execute(
+        in_period(query, SalesDailyClient, start_periodo, end_periodo, client_id)
+    ).one()
+
+    return {
+        'order_count': order_count,
+        'revenue': round(revenue, 2),
+        'average_ticket': round(revenue / order_count, 2) if order_count else 0,
+    }
+
+
+@router.post('/refresh', status_code=HTTPStatus.OK, response_model=RollupRefresh)
+def refresh_rollups(
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    return {'refreshed_days': refresh_sales_rollups(session)}
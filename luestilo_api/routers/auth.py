@@ -4,9 +4,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jwt import DecodeError, decode
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from luestilo_api.database import get_session
+from luestilo_api.database import get_async_session, get_session
 from luestilo_api.models import User
 from luestilo_api.schemas import CurrentUser, Token, UserPublic, UserSchema
 from luestilo_api.security import (
@@ -23,7 +24,7 @@ router = APIRouter(tags=['auth'])
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> CurrentUser:
     try:
         payload = decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -49,7 +50,7 @@ async def get_current_user(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred: {e}",
         )
-    db_user = session.scalar(select(User).where(User.id == user_id, User.username == username))
+    db_user = await session.scalar(select(User).where(User.id == user_id, User.username == username))
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,23 +1,47 @@
+import csv
+import io
 from http import HTTPStatus
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Body, Depends, File, Header, HTTPException, Query, Response, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
-from luestilo_api.database import get_session
+from luestilo_api.database import dialect_insert, get_read_session, get_session
+from luestilo_api.idempotency import claim_idempotency_key, complete_idempotency_key
 from luestilo_api.models import Client
-from luestilo_api.schemas import ClientList, ClientPublic, ClientSchema, Message, CurrentUser
+from luestilo_api.pagination import next_cursor, paginate
+from luestilo_api.responses import dump_json, model_response
+from luestilo_api.schemas import (
+    ClientImportReport,
+    ClientList,
+    ClientPublic,
+    ClientSchema,
+    CurrentUser,
+    Message,
+    validation_detail,
+)
+from luestilo_api.search import unaccent_contains
 from luestilo_api.security import get_current_user
+from luestilo_api.settings import Settings
 
 router = APIRouter(prefix='/clients', tags=['clients'])
 
+settings = Settings()
+
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=ClientPublic)
 def create_client(
-    client: ClientSchema, session: Session = Depends(get_session),
+    client: ClientSchema,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    session: Session = Depends(get_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
+    replay = claim_idempotency_key(session, current_user.id, 'clients', idempotency_key, client)
+    if replay is not None:
+        return replay
+
     db_client = session.scalar(
         select(Client).where(
             (Client.cpf == client.cpf) | (Client.email == client.email)
@@ -43,33 +67,129 @@ def create_client(
         numero_whatsapp=client.numero_whatsapp,
         aceita_notificacoes_whatsapp=client.aceita_notificacoes_whatsapp)
     session.add(db_client)
+    session.flush()
+    body = dump_json(ClientPublic, db_client)
+    complete_idempotency_key(session, current_user.id, 'clients', idempotency_key, HTTPStatus.CREATED, body)
     session.commit()
-    session.refresh(db_client)
-    return db_client
+    return Response(content=body, status_code=HTTPStatus.CREATED, media_type='application/json')
+
+
+def import_client_batch(session: Session, batch: list) -> list:
+    results = []
+    valid_clients = []
+    for row_number, row in batch:
+        try:
+            valid_clients.append((row_number, ClientSchema.model_validate(row)))
+        except ValidationError as error:
+            results.append({'row': row_number, 'status': 'invalid', 'detail': validation_detail(error)})
+
+    if not valid_clients:
+        return results
+
+    existing = session.execute(
+        select(Client.cpf, Client.email).where(
+            or_(
+                Client.cpf.in_({client.cpf for _, client in valid_clients}),
+                Client.email.in_({client.email for _, client in valid_clients}),
+            )
+        )
+    ).all()
+    taken_cpfs = {cpf for cpf, _ in existing}
+    taken_emails = {email for _, email in existing}
+
+    pending = []
+    for row_number, client in valid_clients:
+        if client.cpf in taken_cpfs:
+            results.append({'row': row_number, 'status': 'conflict', 'detail': 'CPF already exists'})
+        elif client.email in taken_emails:
+            results.append({'row': row_number, 'status': 'conflict', 'detail': 'Email already exists'})
+        else:
+            taken_cpfs.add(client.cpf)
+            taken_emails.add(client.email)
+            pending.append((row_number, client))
+
+    if pending:
+        inserted = dict(
+            session.execute(
+                dialect_insert(session, Client)
+                .values([client.model_dump() for _, client in pending])
+                .on_conflict_do_nothing()
+                .returning(Client.cpf, Client.id)
+            ).all()
+        )
+        session.commit()
+
+        for row_number, client in pending:
+            if client.cpf in inserted:
+                results.append({'row': row_number, 'status': 'created', 'id': inserted[client.cpf]})
+            else:
+                results.append({'row': row_number, 'status': 'conflict', 'detail': 'Client already exists'})
+
+    return results
+
+
+def import_client_rows(session: Session, rows: Iterable[Dict[str, Any]]) -> dict:
+    results = []
+    batch = []
+    for row_number, row in enumerate(rows, start=1):
+        batch.append((row_number, row))
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            results.extend(import_client_batch(session, batch))
+            batch = []
+    if batch:
+        results.extend(import_client_batch(session, batch))
+
+    results.sort(key=lambda result: result['row'])
+    return {
+        'created': sum(result['status'] == 'created' for result in results),
+        'conflicts': sum(result['status'] == 'conflict' for result in results),
+        'invalid': sum(result['status'] == 'invalid' for result in results),
+        'results': results,
+    }
+
+
+@router.post('/import', status_code=HTTPStatus.OK, response_model=ClientImportReport)
+def import_clients(
+    clients: List[Dict[str, Any]] = Body(..., examples=[[ClientSchema.model_config['json_schema_extra']['example']]]),
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    return import_client_rows(session, clients)
+
+
+@router.post('/import/csv', status_code=HTTPStatus.OK, response_model=ClientImportReport)
+def import_clients_csv(
+    file: UploadFile = File(..., description="CSV com cabeçalho: name,cpf,email,numero_whatsapp,aceita_notificacoes_whatsapp"),
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    rows = csv.DictReader(io.TextIOWrapper(file.file, encoding='utf-8-sig'))
+    return import_client_rows(session, ({key: value for key, value in row.items() if value} for row in rows))
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=ClientList)
 def read_all_clients(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description="Cursor retornado em 'next_cursor' pela página anterior (ignora 'skip')"),
     name: Optional[str] = Query(None, description="Filtrar por nome do cliente (parcial, case-insensitive)"),
     email: Optional[str] = Query(None, description="Filtrar por e-mail do cliente (parcial, case-insensitive)"),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     query = select(Client).where(Client.is_active == True)
 
     if name:
-        query = query.where(Client.name.ilike(f'%{name}%'))
+        query = query.where(unaccent_contains(Client.name, name))
 
     if email:
         query = query.where(Client.email.ilike(f'%{email}%'))
 
-    query = query.offset(skip).limit(limit)
+    query = paginate(query, [Client.id], skip, limit, after)
 
     clients = session.scalars(query).all()
 
-    return {'clients': clients}
+    return model_response(ClientList, {'clients': clients, 'next_cursor': next_cursor(clients, [Client.id], limit)})
 
 
 @router.get(
@@ -77,7 +197,7 @@ def read_all_clients(
     status_code=HTTPStatus.OK,
     response_model=ClientPublic,
 )
-def read_client(client_id: int, session: Session = Depends(get_session), current_user: CurrentUser = Depends(get_current_user)):
+def read_client(client_id: int, session: Session = Depends(get_read_session), current_user: CurrentUser = Depends(get_current_user)):
     db_client = session.scalar(select(Client).where(Client.id == client_id))
     if not db_client:
         raise HTTPException(
@@ -118,7 +238,7 @@ def update_client(
     response_model=Message,
 )
 def delete_client(
-    client_id: int, 
+    client_id: int,
     session: Session = Depends(get_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
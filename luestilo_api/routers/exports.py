@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from luestilo_api.database import get_read_session
+from luestilo_api.models import Client, Order, OrderProduct, Product
+from luestilo_api.schemas import CurrentUser
+from luestilo_api.security import get_current_user
+from luestilo_api.settings import Settings
+
+router = APIRouter(prefix='/exports', tags=['exports'])
+
+settings = Settings()
+
+MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def export_value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, list):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def stream_rows(bind, query, export_format: str):
+    # The request session is closed before the body is streamed, so the export owns its own session.
+    with Session(bind) as session:
+        result = session.execute(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(columns)
+            yield buffer.getvalue()
+
+        for partition in result.partitions():
+            buffer = io.StringIO()
+            if export_format == 'csv':
+                csv.writer(buffer).writerows([export_value(value) for value in row] for row in partition)
+            else:
+                for row in partition:
+                    buffer.write(json.dumps(dict(zip(columns, row)), default=export_value, ensure_ascii=False))
+                    buffer.write('\n')
+            yield buffer.getvalue()
+
+
+def export_response(session: Session, query, export_format: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(session.get_bind(), query, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{name}.{export_format}"'},
+    )
+
+
+@router.get('/clients')
+def export_clients(
+    export_format: str = Query('ndjson', alias='format', pattern='^(ndjson|csv)$'),
+    include_inactive: bool = Query(False, description='Incluir clientes desativados'),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    query = select(
+        Client.id,
+        Client.name,
+        Client.cpf,
+        Client.email,
+        Client.is_active,
+        Client.numero_whatsapp,
+        Client.aceita_notificacoes_whatsapp,
+    ).order_by(Client.id)
+
+    if not include_inactive:
+        query = query.where(Client.is_active == True)
+
+    return export_response(session, query, export_format, 'clients')
+
+
+@router.get('/products')
+def export_products(
+    export_format: str = Query('ndjson', alias='format', pattern='^(ndjson|csv)$'),
+    include_inactive: bool = Query(False, description='Incluir produtos desativados'),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    query = select(
+        Product.id,
+        Product.descricao,
+        Product.valor_de_venda,
+        Product.codigo_de_barras,
+        Product.secao,
+        Product.estoque.label('estoque_inicial'),
+        Product.data_validade,
+        Product.imagens,
+        Product.is_active,
+    ).order_by(Product.id)
+
+    if not include_inactive:
+        query = query.where(Product.is_active == True)
+
+    return export_response(session, query, export_format, 'products')
+
+
+@router.get('/orders')
+def export_orders(
+    export_format: str = Query('ndjson', alias='format', pattern='^(ndjson|csv)$'),
+    include_inactive: bool = Query(False, description='Incluir pedidos desativados'),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    query = (
+        select(
+            Order.id.label('order_id'),
+            Order.client_id,
+            Order.status,
+            Order.periodo,
+            Order.is_active,
+            OrderProduct.product_id,
+            OrderProduct.quantity,
+            OrderProduct.price_at_order,
+        )
+        .outerjoin(OrderProduct, OrderProduct.order_id == Order.id)
+        .order_by(Order.id, OrderProduct.product_id)
+    )
+
+    if not include_inactive:
+        query = query.where(Order.is_active == True)
+
+    return export_response(session, query, export_format, 'orders')
@@ -0,0 +1,43 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from luestilo_api.database import get_session
+from luestilo_api.models import BroadcastJob, BroadcastRecipient
+from luestilo_api.schemas import BroadcastJobStatus, CurrentUser
+from luestilo_api.security import get_current_user
+
+router = APIRouter(prefix='/jobs', tags=['jobs'])
+
+
+@router.get('/{job_id}', status_code=HTTPStatus.OK, response_model=BroadcastJobStatus)
+def read_job(
+    job_id: int,
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    job = session.scalar(select(BroadcastJob).where(BroadcastJob.id == job_id))
+    if not job:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Job not found'
+        )
+
+    counts = dict(
+        session.execute(
+            select(BroadcastRecipient.status, func.count())
+            .where(BroadcastRecipient.job_id == job_id)
+            .group_by(BroadcastRecipient.status)
+        ).all()
+    )
+
+    return {
+        'id': job.id,
+        'mensagem': job.mensagem,
+        'created_at': job.created_at,
+        'total': sum(counts.values()),
+        'sent': counts.get('sent', 0),
+        'failed': counts.get('failed', 0),
+        'pending': counts.get('pending', 0) + counts.get('sending', 0),
+    }
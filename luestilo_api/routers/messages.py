@@ -1,33 +1,34 @@
 from http import HTTPStatus
-from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import insert, literal, select
 
 from luestilo_api.database import get_session
-from luestilo_api.models import Client as ClientModel 
-from luestilo_api.schemas import SendMessageToClientBody, CurrentUser 
+from luestilo_api.models import BroadcastJob, BroadcastRecipient, Client as ClientModel
+from luestilo_api.schemas import BroadcastJobCreated, SendMessageToClientBody, CurrentUser
 from luestilo_api.security import get_current_user
+from luestilo_api.whatsapp import SimulatedWhatsAppProvider, WhatsAppProvider, WhatsAppSendError
 
 
 router = APIRouter(tags=['message'])
 
-def simulate_whatsapp_send(phone_number: str, message: str):
-    print(f"--- SIMULANDO ENVIO DE WHATSAPP ---")
-    print(f"Para: {phone_number}")
-    print(f"Mensagem: {message}")
-    print(f"------------------------------------")
-    return True
+whatsapp_provider = SimulatedWhatsAppProvider()
+
+
+def get_whatsapp_provider() -> WhatsAppProvider:
+    return whatsapp_provider
 
 
 @router.post("/send_to_client/{client_id}", status_code=HTTPStatus.OK)
-def send_message_to_client(
+async def send_message_to_client(
     client_id: int,
-    message_data: SendMessageToClientBody, 
+    message_data: SendMessageToClientBody,
     session: Session = Depends(get_session),
-    current_user: CurrentUser = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    provider: WhatsAppProvider = Depends(get_whatsapp_provider)
 ):
-    client = session.scalar(select(ClientModel).where(ClientModel.id == client_id)) 
+    client = await run_in_threadpool(session.scalar, select(ClientModel).where(ClientModel.id == client_id))
 
     if client is None:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
@@ -44,44 +45,37 @@ def send_message_to_client(
             detail="Número de WhatsApp não cadastrado para este cliente."
         )
 
-    send_success = simulate_whatsapp_send(client.numero_whatsapp, message_data.mensagem)
-
-    if not send_success:
+    try:
+        await provider.send(client.numero_whatsapp, message_data.mensagem)
+    except WhatsAppSendError:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Falha ao enviar mensagem de WhatsApp.")
 
     return {"message": "Mensagem enviada com sucesso!", "client_id": client.id}
 
 
-@router.post("/send_to_all_clients", status_code=HTTPStatus.OK)
+@router.post("/send_to_all_clients", status_code=HTTPStatus.ACCEPTED, response_model=BroadcastJobCreated)
 def send_message_to_all_clients(
-    message_data: SendMessageToClientBody, 
+    message_data: SendMessageToClientBody,
     session: Session = Depends(get_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
-    clients_to_notify = session.scalars(
-        select(ClientModel).where(
-            ClientModel.aceita_notificacoes_whatsapp == True,
-            ClientModel.numero_whatsapp.isnot(None)
+    job = BroadcastJob(mensagem=message_data.mensagem)
+    session.add(job)
+    session.flush()
+
+    enqueued = session.execute(
+        insert(BroadcastRecipient).from_select(
+            ['job_id', 'client_id', 'numero_whatsapp'],
+            select(literal(job.id), ClientModel.id, ClientModel.numero_whatsapp).where(
+                ClientModel.aceita_notificacoes_whatsapp == True,
+                ClientModel.numero_whatsapp.isnot(None)
+            ),
         )
-    ).all()
-
-    if not clients_to_notify:
-        return {"message": "Nenhum cliente elegível para receber notificações."}
-
-    sent_count = 0
-    failed_clients = []
-
-    for client in clients_to_notify:
-        send_success = simulate_whatsapp_send(client.numero_whatsapp, message_data.mensagem)
-        if send_success:
-            sent_count += 1
-        else:
-            failed_clients.append({"id": client.id, "reason": "Falha no envio da API de WhatsApp"})
+    )
+    session.commit()
 
     return {
-        "message": f"Mensagens enviadas para {sent_count} clientes elegíveis.",
-        "total_eligible": len(clients_to_notify),
-        "failed_to_send_count": len(failed_clients),
-        "failed_clients_details": failed_clients
+        "job_id": job.id,
+        "total_eligible": enqueued.rowcount,
+        "message": f"Envio agendado para {enqueued.rowcount} clientes elegíveis.",
     }
-   
\ No newline at end of file
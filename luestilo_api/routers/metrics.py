@@ -0,0 +1,31 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from luestilo_api.database import pool_stats, render_pool_metrics
+from luestilo_api.instrumentation import route_metrics
+from luestilo_api.schemas import CacheStats, CurrentUser, HashingStats, PoolStats
+from luestilo_api.security import get_current_user, hashing_pool, user_cache
+
+router = APIRouter(prefix='/metrics', tags=['metrics'])
+
+
+@router.get('', status_code=HTTPStatus.OK, response_class=PlainTextResponse)
+def read_prometheus_metrics():
+    return PlainTextResponse(route_metrics.render() + render_pool_metrics(), media_type='text/plain; version=0.0.4')
+
+
+@router.get('/cache', status_code=HTTPStatus.OK, response_model=CacheStats)
+def read_cache_stats(current_user: CurrentUser = Depends(get_current_user)):
+    return user_cache.stats()
+
+
+@router.get('/hashing', status_code=HTTPStatus.OK, response_model=HashingStats)
+def read_hashing_stats(current_user: CurrentUser = Depends(get_current_user)):
+    return hashing_pool.stats()
+
+
+@router.get('/pool', status_code=HTTPStatus.OK, response_model=dict[str, PoolStats])
+def read_pool_stats(current_user: CurrentUser = Depends(get_current_user)):
+    return pool_stats()
@@ -2,81 +2,152 @@ from datetime import date
 from http import HTTPStatus
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
-
-from luestilo_api.security import get_current_user
-from luestilo_api.database import get_session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from luestilo_api.catalog_cache import catalog_cache
+from luestilo_api.database import get_read_session, get_session
+from luestilo_api.idempotency import claim_idempotency_key, complete_idempotency_key
+from luestilo_api.inventory import record_movements, reserve_stock
 from luestilo_api.models import Client, Order, OrderProduct, Product
-from luestilo_api.schemas import Message, OrderCreateSchema, OrderList, OrderPublic, CurrentUser
+from luestilo_api.pagination import next_cursor, paginate
+from luestilo_api.responses import dump_json, model_response
+from luestilo_api.schemas import (
+    CurrentUser,
+    Message,
+    OrderCreateSchema,
+    OrderList,
+    OrderPublic,
+    OrderSummaryList,
+    OrderTotalsList,
+)
+from luestilo_api.search import unaccent_contains
+from luestilo_api.security import get_current_user
 
 router = APIRouter(prefix='/orders', tags=['orders'])
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=OrderPublic)
 def create_order(
-    order_data: OrderCreateSchema, 
+    order_data: OrderCreateSchema,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     session: Session = Depends(get_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
+    replay = claim_idempotency_key(session, current_user.id, 'orders', idempotency_key, order_data)
+    if replay is not None:
+        return replay
+
     db_client = session.scalar(select(Client).where(Client.id == order_data.client_id))
     if not db_client:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='Client not found'
         )
 
-    db_order = Order(
-        client_id=order_data.client_id,
-        status=order_data.status,
-        periodo=order_data.periodo
-    )
-    session.add(db_order)
-    session.flush()
-
+    requested_quantities = {}
+    requested_prices = {}
     for item_data in order_data.items:
-        db_product = session.scalar(select(Product).where(Product.id == item_data.product_id))
-        if not db_product:
+        requested_quantities[item_data.product_id] = (
+            requested_quantities.get(item_data.product_id, 0) + item_data.quantity
+        )
+        if item_data.price_at_order is not None:
+            requested_prices[item_data.product_id] = item_data.price_at_order
+
+    db_products = {
+        db_product.id: db_product
+        for db_product in session.scalars(
+            select(Product).where(Product.id.in_(requested_quantities))
+        )
+    }
+
+    for product_id in requested_quantities:
+        if product_id not in db_products:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND,
-                detail=f'Product with ID {item_data.product_id} not found',
+                detail=f'Product with ID {product_id} not found',
             )
 
-        requested_quantity = item_data.quantity
-        if db_product.estoque_inicial < requested_quantity:
-            raise HTTPException(
-                status_code=HTTPStatus.BAD_REQUEST,
-                detail=f'Insufficient stock for product {db_product.descricao}. Available: {db_product.estoque_inicial}, Requested: {requested_quantity}',
-            )
+    shortfalls = reserve_stock(session, requested_quantities)
+    if shortfalls:
+        product_id, available = min(shortfalls.items())
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=(
+                f'Insufficient stock for product {db_products[product_id].descricao}. '
+                f'Available: {available}, Requested: {requested_quantities[product_id]}'
+            ),
+        )
 
-        db_product.estoque_inicial -= requested_quantity
-        session.add(db_product)
+    items = [
+        {
+            'product_id': product_id,
+            'quantity': requested_quantity,
+            'price_at_order': requested_prices.get(product_id, db_products[product_id].valor_de_venda),
+        }
+        for product_id, requested_quantity in requested_quantities.items()
+    ]
 
-        price_to_use = item_data.price_at_order if item_data.price_at_order is not None else db_product.valor_de_venda
+    db_order = Order(
+        client_id=order_data.client_id,
+        status=order_data.status,
+        periodo=order_data.periodo,
+        total_amount=round(sum(item['quantity'] * item['price_at_order'] for item in items), 2),
+        item_count=sum(item['quantity'] for item in items),
+    )
+    session.add(db_order)
+    session.flush()
 
-        db_order_product = OrderProduct(
-            order_id=db_order.id,
-            product_id=db_product.id,
-            quantity=requested_quantity,
-            price_at_order=price_to_use
+    if items:
+        record_movements(
+            session,
+            [
+                {
+                    'product_id': item['product_id'],
+                    'quantity': -item['quantity'],
+                    'reason': 'order',
+                    'order_id': db_order.id,
+                }
+                for item in items
+            ],
         )
-        session.add(db_order_product)
 
+        session.execute(insert(OrderProduct), [{'order_id': db_order.id, **item} for item in items])
+
+    db_order = session.scalar(
+        select(Order)
+        .where(Order.id == db_order.id)
+        .options(selectinload(Order.products).selectinload(OrderProduct.product))
+        .execution_options(populate_existing=True)
+    )
+    body = dump_json(OrderPublic, db_order)
+    complete_idempotency_key(session, current_user.id, 'orders', idempotency_key, HTTPStatus.CREATED, body)
     session.commit()
-    session.refresh(db_order)
-    return db_order
+    catalog_cache.invalidate_products(requested_quantities)
+
+    return Response(content=body, status_code=HTTPStatus.CREATED, media_type='application/json')
 
 
-@router.get('/', status_code=HTTPStatus.OK, response_model=OrderList)
+@router.get('/', status_code=HTTPStatus.OK, response_model=OrderList | OrderSummaryList | OrderTotalsList)
 def read_all_orders(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description="Cursor retornado em 'next_cursor' pela página anterior (ignora 'skip')"),
     start_periodo: Optional[date] = Query(None),
     end_periodo: Optional[date] = Query(None),
     product_section: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     client_id: Optional[int] = Query(None),
-    session: Session = Depends(get_session),
+    min_total: Optional[float] = Query(None),
+    max_total: Optional[float] = Query(None),
+    sort: str = Query('id', pattern='^(id|total_amount)$'),
+    view: str = Query(
+        'full',
+        pattern='^(full|compact|totals)$',
+        description="'compact' devolve só as colunas dos itens, sem o produto completo; 'totals' não inclui os itens",
+    ),
+    include_products: bool = Query(False, description="Com view=compact, inclui os produtos da página uma única vez em 'products'"),
+    session: Session = Depends(get_read_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     query = select(Order).where(Order.is_active == True)
@@ -92,22 +163,49 @@ def read_all_orders(
     if end_periodo:
         query = query.where(Order.periodo <= end_periodo)
 
+    if min_total is not None:
+        query = query.where(Order.total_amount >= min_total)
+    if max_total is not None:
+        query = query.where(Order.total_amount <= max_total)
+
     if product_section:
-        query = query.join(Order.products).join(OrderProduct.product).where(Product.secao.ilike(f'%{product_section}%'))
+        query = query.where(
+            Order.products.any(OrderProduct.product.has(unaccent_contains(Product.secao, product_section)))
+        )
 
-    query = query.options(joinedload(Order.products).joinedload(OrderProduct.product))
+    if view == 'compact':
+        query = query.options(selectinload(Order.products))
+    elif view == 'full':
+        query = query.options(selectinload(Order.products).selectinload(OrderProduct.product))
 
-    query = query.offset(skip).limit(limit)
+    sort_columns = [Order.total_amount, Order.id] if sort == 'total_amount' else [Order.id]
+    query = paginate(query, sort_columns, skip, limit, after)
 
-    orders = session.scalars(query).unique().all()
+    orders = session.scalars(query).all()
+    cursor = next_cursor(orders, sort_columns, limit)
 
-    return {'orders': orders}
+    if view == 'totals':
+        return model_response(OrderTotalsList, {'orders': orders, 'next_cursor': cursor})
+
+    if view == 'full':
+        return model_response(OrderList, {'orders': orders, 'next_cursor': cursor})
+
+    products = None
+    if include_products:
+        product_ids = {item.product_id for order in orders for item in order.products}
+        products = session.execute(
+            select(Product.id, Product.descricao, Product.valor_de_venda, Product.codigo_de_barras, Product.secao)
+            .where(Product.id.in_(product_ids))
+            .order_by(Product.id)
+        ).all() if product_ids else []
+
+    return model_response(OrderSummaryList, {'orders': orders, 'products': products, 'next_cursor': cursor})
 
 
 @router.get('/{order_id}', status_code=HTTPStatus.OK, response_model=OrderPublic)
 def read_order(
-    order_id: int, session: Session = Depends(get_session),
-    current_user: CurrentUser = Depends(get_current_user)    
+    order_id: int, session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     db_order = session.scalar(
         select(Order)
@@ -144,7 +242,7 @@ def update_order(
 
 @router.delete('/{order_id}', status_code=HTTPStatus.OK, response_model=Message)
 def delete_order(
-    order_id: int, 
+    order_id: int,
     session: Session = Depends(get_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
@@ -1,17 +1,44 @@
+import json
+from datetime import datetime
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 from typing import Optional
 
+from luestilo_api.catalog_cache import cached_json_response, catalog_cache
 from luestilo_api.security import get_current_user
 from luestilo_api.database import get_session
-from luestilo_api.models import Product
-from luestilo_api.schemas import ProductList, ProductPublic, ProductSchema, Message, CurrentUser
+from luestilo_api.inventory import add_stock, open_stock, set_stock, stock_at
+from luestilo_api.models import Product, StockMovement
+from luestilo_api.pagination import next_cursor, paginate
+from luestilo_api.responses import dump_json
+from luestilo_api.search import unaccent_contains
+from luestilo_api.schemas import (
+    CurrentUser,
+    Message,
+    ProductImportReport,
+    ProductList,
+    ProductPublic,
+    ProductSchema,
+    StockLevel,
+    StockMovementList,
+    validation_detail,
+)
+from luestilo_api.settings import Settings
 
 router = APIRouter(prefix='/products', tags=['products']) 
 
+settings = Settings()
+
+PRODUCT_FIELDS = list(ProductSchema.model_fields)
+PRODUCT_COLUMNS = {field: getattr(Product, field) for field in PRODUCT_FIELDS} | {
+    'estoque_inicial': Product.estoque.label('estoque_inicial')
+}
+
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=ProductPublic)
 def create_product(
     product: ProductSchema, 
@@ -31,24 +58,134 @@ def create_product(
     session.add(db_product)
     session.commit()
     session.refresh(db_product)
+    catalog_cache.invalidate_products([db_product.id])
     return db_product
 
 
+def upsert_product_chunk(session: Session, chunk: dict, report: dict):
+    existing = {
+        row.codigo_de_barras: row
+        for row in session.execute(
+            select(Product.id, *(PRODUCT_COLUMNS[field] for field in PRODUCT_FIELDS)).where(
+                Product.codigo_de_barras.in_(chunk)
+            )
+        )
+    }
+
+    inserts = []
+    updates = []
+    stock_changes = {}
+    for barcode, product in chunk.items():
+        values = product.model_dump()
+        values['imagens'] = values['imagens'] or []
+        current = existing.get(barcode)
+        if current is None:
+            inserts.append(values)
+            continue
+
+        changed = {field: value for field, value in values.items() if getattr(current, field) != value}
+        if not changed:
+            report['unchanged'] += 1
+            continue
+        if 'estoque_inicial' in changed:
+            stock_changes[current.id] = changed.pop('estoque_inicial')
+        updates.append({'id': current.id, **changed})
+
+    if inserts:
+        created = session.execute(insert(Product).returning(Product.id, Product.estoque_inicial), inserts)
+        open_stock(session, dict(created.all()))
+    field_updates = [row for row in updates if len(row) > 1]
+    if field_updates:
+        session.execute(update(Product), field_updates)
+    set_stock(session, stock_changes)
+    session.commit()
+
+    if inserts or updates:
+        catalog_cache.invalidate_products(row['id'] for row in updates)
+
+    report['inserted'] += len(inserts)
+    report['updated'] += len(updates)
+
+
+@router.post('/import', status_code=HTTPStatus.OK, response_model=ProductImportReport)
+async def import_products(
+    request: Request,
+    chunk_size: int = Query(
+        settings.PRODUCT_IMPORT_CHUNK_SIZE, ge=1, le=10000, description="Produtos gravados por transação"
+    ),
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    report = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0, 'errors': []}
+    chunk = {}
+    line_number = 0
+    pending = b''
+
+    async def handle_line(raw_line: bytes):
+        nonlocal chunk, line_number
+        line_number += 1
+        if not raw_line.strip():
+            return
+        try:
+            product = ProductSchema.model_validate(json.loads(raw_line))
+        except json.JSONDecodeError as error:
+            report['errors'].append({'line': line_number, 'detail': f'Invalid JSON: {error.msg}'})
+            return
+        except ValidationError as error:
+            report['errors'].append({'line': line_number, 'detail': validation_detail(error)})
+            return
+
+        # A repeated barcode inside one chunk would collide with itself, so the chunk is written first.
+        if product.codigo_de_barras in chunk or len(chunk) >= chunk_size:
+            await run_in_threadpool(upsert_product_chunk, session, chunk, report)
+            chunk = {}
+        chunk[product.codigo_de_barras] = product
+
+    async for data in request.stream():
+        pending += data
+        *lines, pending = pending.split(b'\n')
+        for raw_line in lines:
+            await handle_line(raw_line)
+    await handle_line(pending)
+
+    if chunk:
+        await run_in_threadpool(upsert_product_chunk, session, chunk, report)
+
+    report['invalid'] = len(report['errors'])
+    return report
+
+
 @router.get('/', status_code=HTTPStatus.OK, response_model=ProductList)
 def read_all_products(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description="Cursor retornado em 'next_cursor' pela página anterior (ignora 'skip')"),
     secao: Optional[str] = Query(None),
     min_price: Optional[float] = Query(None),
     max_price: Optional[float] = Query(None),
     available: Optional[bool] = Query(None),
+    # Cache fills stay on the primary: a lagging replica could refill an invalidated key with stale rows.
     session: Session = Depends(get_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
+    cache_key = catalog_cache.list_key({
+        'skip': skip if not after else None,
+        'limit': limit,
+        'after': after,
+        'secao': secao,
+        'min_price': min_price,
+        'max_price': max_price,
+        'available': available,
+    })
+    cached = catalog_cache.get(cache_key)
+    if cached:
+        return cached_json_response(request, *cached)
+
     query = select(Product).where(Product.is_active == True)
 
     if secao:
-        query = query.where(Product.secao.ilike(f'%{secao}%'))
+        query = query.where(unaccent_contains(Product.secao, secao))
 
     if min_price is not None:
         query = query.where(Product.valor_de_venda >= min_price)
@@ -57,29 +194,37 @@ def read_all_products(
         query = query.where(Product.valor_de_venda <= max_price)
 
     if available is True:
-        query = query.where(Product.estoque_inicial > 0)
+        query = query.where(Product.estoque > 0)
     elif available is False:
-        query = query.where(Product.estoque_inicial <= 0)
+        query = query.where(Product.estoque <= 0)
 
-    query = query.offset(skip).limit(limit)
+    query = paginate(query, [Product.id], skip, limit, after)
 
     products = session.scalars(query).all()
 
-    return {'products': products}
+    body = dump_json(ProductList, {'products': products, 'next_cursor': next_cursor(products, [Product.id], limit)})
+    return cached_json_response(request, *catalog_cache.set(cache_key, body))
 
 
 @router.get('/{product_id}', status_code=HTTPStatus.OK, response_model=ProductPublic)
 def read_product(
+    request: Request,
     product_id: int, 
     session: Session = Depends(get_session),
     current_user: CurrentUser = Depends(get_current_user)
 ):
+    cache_key = catalog_cache.product_key(product_id)
+    cached = catalog_cache.get(cache_key)
+    if cached:
+        return cached_json_response(request, *cached)
+
     db_product = session.scalar(select(Product).where(Product.id == product_id))
     if not db_product:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='Product not found'
         )
-    return db_product
+
+    return cached_json_response(request, *catalog_cache.set(cache_key, dump_json(ProductPublic, db_product)))
 
 
 @router.put('/{product_id}', status_code=HTTPStatus.OK, response_model=ProductPublic)
@@ -107,11 +252,17 @@ def update_product(product_id: int,
                 detail='Product with this barcode already exists for another product',
             )
 
-    for key, value in product.model_dump(exclude_unset=True).items():
+    values = product.model_dump(exclude_unset=True)
+    stock = values.pop('estoque_inicial', None)
+    for key, value in values.items():
         setattr(db_product, key, value)
+    session.flush()
+    if stock is not None:
+        set_stock(session, {product_id: stock})
 
     session.commit()
     session.refresh(db_product)
+    catalog_cache.invalidate_products([product_id])
     return db_product
 
 
@@ -128,6 +279,7 @@ def delete_product(
     db_product.is_active = False
     session.add(db_product)
     session.commit()
+    catalog_cache.invalidate_products([product_id])
     return {'message': 'Product deleted'}
 
 @router.patch('/products/{product_id}/reactivate', status_code=HTTPStatus.OK, response_model=ProductPublic)
@@ -144,12 +296,48 @@ def reactivate_product(
             status_code=HTTPStatus.NOT_FOUND, detail='Product not found'
         )
     db_product.is_active = True
-    
-   
-    db_product.estoque_inicial += quantity_to_add
+    add_stock(session, {product_id: quantity_to_add})
 
     session.add(db_product)
     session.commit()
     session.refresh(db_product)
+    catalog_cache.invalidate_products([product_id])
+
+    return db_product
+
 
-    return db_product
\ No newline at end of file
+@router.get('/{product_id}/stock', status_code=HTTPStatus.OK, response_model=StockLevel)
+def read_product_stock(
+    product_id: int,
+    at: Optional[datetime] = Query(None, description="Consulta o estoque histórico neste momento"),
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    estoque = session.scalar(select(Product.estoque).where(Product.id == product_id))
+    if estoque is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Product not found'
+        )
+
+    if at is not None:
+        estoque = stock_at(session, product_id, at)
+
+    return {'product_id': product_id, 'estoque': estoque, 'at': at}
+
+
+@router.get('/{product_id}/stock/movements', status_code=HTTPStatus.OK, response_model=StockMovementList)
+def read_product_stock_movements(
+    product_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    movements = session.scalars(
+        select(StockMovement)
+        .where(StockMovement.product_id == product_id)
+        .order_by(StockMovement.id.desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    return {'movements': movements}
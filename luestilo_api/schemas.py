@@ -1,10 +1,16 @@
-from datetime import date
+from datetime import date, datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, EmailStr, Field, ValidationError
 from pydantic_br import CPF
 
 
+def validation_detail(error: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
 class Message(BaseModel):
     message: str
 
@@ -48,6 +54,21 @@ class ClientPublic(BaseModel):
 
 class ClientList(BaseModel):
     clients: List[ClientPublic]
+    next_cursor: Optional[str] = Field(None, description="Cursor para a próxima página (parâmetro 'after').", example="WzEwMF0=")
+
+
+class ClientImportResult(BaseModel):
+    row: int = Field(..., description="Posição da linha no arquivo/lista (começando em 1).", example=1)
+    status: str = Field(..., description="created, conflict ou invalid.", example="created")
+    id: Optional[int] = Field(None, example=42)
+    detail: Optional[str] = Field(None, example="CPF already exists")
+
+
+class ClientImportReport(BaseModel):
+    created: int = Field(..., example=998)
+    conflicts: int = Field(..., example=1)
+    invalid: int = Field(..., example=1)
+    results: List[ClientImportResult]
 
 
 class ProductSchema(BaseModel):
@@ -67,7 +88,9 @@ class ProductPublic(BaseModel):
     valor_de_venda: float = Field(..., example=59.99)
     codigo_de_barras: str = Field(..., example="7891234567890")
     secao: str = Field(..., example="Vestuário Feminino")
-    estoque_inicial: int = Field(..., example=100)
+    estoque_inicial: int = Field(
+        ..., validation_alias=AliasChoices('estoque', 'estoque_inicial'), description="Estoque atual", example=100
+    )
     data_validade: Optional[date] = Field(None, example=date(2025, 12, 31))
     imagens: Optional[List[str]] = Field(None, example=["http://example.com/img1.jpg", "http://example.com/img2.png"])
     is_active: bool = Field(..., example=True)
@@ -75,6 +98,20 @@ class ProductPublic(BaseModel):
 
 class ProductList(BaseModel):
     products: List[ProductPublic]
+    next_cursor: Optional[str] = Field(None, description="Cursor para a próxima página (parâmetro 'after').", example="WzEwMF0=")
+
+
+class ProductImportError(BaseModel):
+    line: int = Field(..., description="Linha do NDJSON (começando em 1).", example=12)
+    detail: str = Field(..., example="valor_de_venda: Input should be a valid number")
+
+
+class ProductImportReport(BaseModel):
+    inserted: int = Field(..., example=120)
+    updated: int = Field(..., example=3400)
+    unchanged: int = Field(..., example=46480)
+    invalid: int = Field(..., example=1)
+    errors: List[ProductImportError]
 
 
 class OrderProductSchema(BaseModel):
@@ -129,11 +166,119 @@ class OrderPublic(BaseModel):
     periodo: date = Field(..., example=date(2025, 5, 26))
     client_id: int = Field(..., example=1)
     is_active: bool = Field(..., example=True)
+    total_amount: float = Field(..., description="Soma de quantity * price_at_order dos itens.", example=139.78)
+    item_count: int = Field(..., description="Quantidade total de unidades no pedido.", example=3)
     products: List[OrderItemPublic]
 
 
 class OrderList(BaseModel):
     orders: List[OrderPublic]
+    next_cursor: Optional[str] = Field(None, description="Cursor para a próxima página (parâmetro 'after').", example="WzEwMF0=")
+
+
+class ProductSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int = Field(..., example=1)
+    descricao: str = Field(..., example="Camiseta Algodão Branca M")
+    valor_de_venda: float = Field(..., example=59.99)
+    codigo_de_barras: str = Field(..., example="7891234567890")
+    secao: str = Field(..., example="Vestuário Feminino")
+
+
+class OrderItemSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    product_id: int = Field(..., example=1)
+    quantity: int = Field(..., example=2)
+    price_at_order: float = Field(..., example=59.99)
+
+
+class OrderSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int = Field(..., example=1)
+    status: str = Field(..., example="processando")
+    periodo: date = Field(..., example=date(2025, 5, 26))
+    client_id: int = Field(..., example=1)
+    is_active: bool = Field(..., example=True)
+    total_amount: float = Field(..., description="Soma de quantity * price_at_order dos itens.", example=139.78)
+    item_count: int = Field(..., description="Quantidade total de unidades no pedido.", example=3)
+    products: List[OrderItemSummary]
+
+
+class OrderTotals(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int = Field(..., example=1)
+    status: str = Field(..., example="processando")
+    periodo: date = Field(..., example=date(2025, 5, 26))
+    client_id: int = Field(..., example=1)
+    is_active: bool = Field(..., example=True)
+    total_amount: float = Field(..., example=139.78)
+    item_count: int = Field(..., example=3)
+
+
+class OrderTotalsList(BaseModel):
+    orders: List[OrderTotals]
+    next_cursor: Optional[str] = Field(None, description="Cursor para a próxima página (parâmetro 'after').", example="WzEwMF0=")
+
+
+class OrderSummaryList(BaseModel):
+    orders: List[OrderSummary]
+    products: Optional[List[ProductSummary]] = Field(
+        None, description="Produtos referenciados pelos itens da página, sem repetição (apenas com include_products)."
+    )
+    next_cursor: Optional[str] = Field(None, description="Cursor para a próxima página (parâmetro 'after').", example="WzEwMF0=")
+
+
+class RevenueBucket(BaseModel):
+    key: str = Field(..., example="2025-05")
+    label: Optional[str] = Field(None, example="Maria Silva")
+    quantity: int = Field(..., example=42)
+    revenue: float = Field(..., example=2519.58)
+
+
+class RevenueReport(BaseModel):
+    group_by: str = Field(..., example="month")
+    buckets: List[RevenueBucket]
+
+
+class TopProduct(BaseModel):
+    product_id: int = Field(..., example=1)
+    descricao: str = Field(..., example="Camiseta Algodão Branca M")
+    secao: str = Field(..., example="Vestuário Feminino")
+    quantity: int = Field(..., example=42)
+    revenue: float = Field(..., example=2519.58)
+
+
+class TopProductList(BaseModel):
+    products: List[TopProduct]
+
+
+class AverageTicket(BaseModel):
+    order_count: int = Field(..., example=120)
+    revenue: float = Field(..., example=15230.40)
+    average_ticket: float = Field(..., example=126.92)
+
+
+class RollupRefresh(BaseModel):
+    refreshed_days: int = Field(..., example=3)
+
+
+class StockMovementPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int = Field(..., example=1)
+    quantity: int = Field(..., description="Positivo para entradas, negativo para saídas", example=-2)
+    reason: str = Field(..., description="initial, order, restock ou adjustment", example="order")
+    order_id: Optional[int] = Field(None, example=1)
+    created_at: datetime = Field(..., example=datetime(2025, 5, 26, 14, 30))
+
+
+class StockMovementList(BaseModel):
+    movements: List[StockMovementPublic]
+
+
+class StockLevel(BaseModel):
+    product_id: int = Field(..., example=1)
+    estoque: int = Field(..., example=98)
+    at: Optional[datetime] = Field(None, description="Momento consultado (vazio para o estoque atual)")
 
 
 class UserSchema(BaseModel):
@@ -201,4 +346,51 @@ class SendMessageToClientBody(BaseModel):
         max_length=1000,
         description="O conteúdo da mensagem a ser enviada.",
         example="Olá, seu pedido #123 foi enviado!" 
-    )
\ No newline at end of file
+    )
+
+class CacheStats(BaseModel):
+    hits: int = Field(..., example=950)
+    misses: int = Field(..., example=50)
+    size: int = Field(..., example=42)
+    maxsize: int = Field(..., example=1024)
+
+
+class HistogramSnapshot(BaseModel):
+    buckets: dict[str, int] = Field(..., example={'0.05': 3, '0.1': 10, '+Inf': 12})
+    count: int = Field(..., example=12)
+    sum: float = Field(..., example=0.84)
+
+
+class HashingStats(BaseModel):
+    max_workers: int = Field(..., example=2)
+    max_pending: int = Field(..., example=32)
+    in_flight: int = Field(..., example=1)
+    rejected: int = Field(..., example=0)
+    latency: dict[str, HistogramSnapshot]
+
+
+class PoolStats(BaseModel):
+    size: int = Field(..., example=5)
+    checked_out: int = Field(..., example=3)
+    overflow: int = Field(..., example=0)
+    checkouts: int = Field(..., example=1200)
+    connects: int = Field(..., example=8)
+    timeouts: int = Field(..., example=0)
+    wait: HistogramSnapshot
+    held: HistogramSnapshot
+
+
+class BroadcastJobCreated(BaseModel):
+    job_id: int = Field(..., example=7)
+    total_eligible: int = Field(..., example=50000)
+    message: str = Field(..., example="Envio agendado para 50000 clientes elegíveis.")
+
+
+class BroadcastJobStatus(BaseModel):
+    id: int = Field(..., example=7)
+    mensagem: str = Field(..., example="Olá, seu pedido #123 foi enviado!")
+    created_at: datetime = Field(..., example=datetime(2025, 5, 26, 10, 30))
+    total: int = Field(..., example=50000)
+    sent: int = Field(..., example=42000)
+    failed: int = Field(..., example=12)
+    pending: int = Field(..., example=7988)
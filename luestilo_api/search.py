@@ -0,0 +1,22 @@
+import sqlite3
+import unicodedata
+
+from sqlalchemy import event, func
+from sqlalchemy.engine import Engine
+
+
+def strip_accents(value: str | None) -> str | None:
+    if value is None:
+        return None
+    return ''.join(char for char in unicodedata.normalize('NFKD', value) if not unicodedata.combining(char))
+
+
+@event.listens_for(Engine, 'connect')
+def register_sqlite_unaccent(dbapi_connection, connection_record):
+    # Postgres gets f_unaccent from the trigram search migration; SQLite (tests) gets a Python equivalent.
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function('f_unaccent', 1, strip_accents, deterministic=True)
+
+
+def unaccent_contains(column, term: str):
+    return func.f_unaccent(column).ilike(f'%{strip_accents(term)}%')
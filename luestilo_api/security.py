@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta
 from http import HTTPStatus
 from zoneinfo import ZoneInfo
@@ -6,9 +7,12 @@ from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, decode, encode
 from pwdlib import PasswordHash
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
 from sqlalchemy.orm import Session
 
+from luestilo_api.cache import TTLCache
+from luestilo_api.hashing import HashingPool
+from luestilo_api.instrumentation import timed
 from luestilo_api.settings import Settings
 from luestilo_api.schemas import CurrentUser
 from luestilo_api.database import get_session
@@ -20,6 +24,13 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 pwd_context = PasswordHash.recommended()
+hashing_pool = HashingPool(
+    max_workers=settings.HASH_POOL_WORKERS, max_pending=settings.HASH_POOL_MAX_PENDING
+)
+
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
 
 
 def create_access_token(data: dict):
@@ -33,20 +44,39 @@ def create_access_token(data: dict):
 
 
 def get_password_hash(password: str):
-    return pwd_context.hash(password)
+    return hashing_pool.run('hash', pwd_context.hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+    return hashing_pool.run('verify', pwd_context.verify, plain_password, hashed_password)
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='token')
 
 
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    user_cache.discard_where(lambda current_user: current_user.id == target.id)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def invalidate_cached_users_on_bulk_write(orm_execute_state):
+    # Bulk ORM update()/delete() statements skip the mapper events above and don't tell us which rows they touch,
+    # so every cached user is dropped. Core statements run on a Connection bypass both hooks.
+    is_bulk_write = orm_execute_state.is_update or orm_execute_state.is_delete
+    if is_bulk_write and orm_execute_state.bind_mapper is inspect(User):
+        user_cache.discard_where(lambda current_user: True)
+
+
+@timed('auth')
 def get_current_user(
     session: Session = Depends(get_session),
     token: str = Depends(oauth2_scheme),
 ) -> CurrentUser:
+    cached_user = user_cache.get(token)
+    if cached_user is not None:
+        return cached_user
 
     credentials_exception = HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
@@ -77,5 +107,7 @@ def get_current_user(
     if not user:
         raise credentials_exception
 
-    
-    return CurrentUser.model_validate(user)
+    current_user = CurrentUser.model_validate(user)
+    user_cache.set(token, current_user, ttl=payload.get('exp', 0) - time.time())
+
+    return current_user
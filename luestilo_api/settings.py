@@ -7,6 +7,37 @@ class Settings(BaseSettings):
     )
 
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_RETRY_SECONDS: float = 30.0
+    READ_YOUR_WRITES_SECONDS: int = 5
     SECRET_KEY: str
     ALGORITHM: str
-    ACCESS_TOKEN_EXPIRE_MINUTES: int
\ No newline at end of file
+    ACCESS_TOKEN_EXPIRE_MINUTES: int
+    USER_CACHE_MAXSIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: int = 300
+    HASH_POOL_WORKERS: int = 2
+    HASH_POOL_MAX_PENDING: int = 32
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    EXPORT_BATCH_SIZE: int = 1000
+    IMPORT_BATCH_SIZE: int = 1000
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 500
+    WHATSAPP_CONCURRENCY: int = 50
+    WHATSAPP_RATE_PER_SECOND: float = 200
+    WHATSAPP_MAX_RETRIES: int = 3
+    WHATSAPP_RETRY_BACKOFF_SECONDS: float = 0.5
+    BROADCAST_BATCH_SIZE: int = 100
+    BROADCAST_POLL_INTERVAL_SECONDS: float = 1.0
+    BROADCAST_MAX_ATTEMPTS: int = 5
+    BROADCAST_CLAIM_TIMEOUT_SECONDS: int = 300
+    SALES_ROLLUP_REFRESH_INTERVAL_SECONDS: float = 60.0
+    STOCK_COMPACTION_INTERVAL_SECONDS: float = 300.0
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 3600.0
+    CACHE_BACKEND: str = 'memory'
+    REDIS_URL: str | None = None
+    CATALOG_CACHE_MAXSIZE: int = 2048
+    CATALOG_CACHE_TTL_SECONDS: int = 60
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Protocol
+
+
+class WhatsAppSendError(Exception):
+    pass
+
+
+class WhatsAppProvider(Protocol):
+    name: str
+
+    async def send(self, phone_number: str, message: str) -> None: ...
+
+
+class SimulatedWhatsAppProvider:
+    name = 'simulated'
+
+    async def send(self, phone_number: str, message: str) -> None:
+        print('--- SIMULANDO ENVIO DE WHATSAPP ---')
+        print(f'Para: {phone_number}')
+        print(f'Mensagem: {message}')
+        print('------------------------------------')
+
+
+class FakeWhatsAppProvider:
+    name = 'fake'
+
+    def __init__(self, failures: dict[str, int] | None = None):
+        self.sent: list[tuple[str, str]] = []
+        self.attempts: Counter = Counter()
+        self.failures = dict(failures or {})
+
+    async def send(self, phone_number: str, message: str) -> None:
+        self.attempts[phone_number] += 1
+        if self.failures.get(phone_number, 0) > 0:
+            self.failures[phone_number] -= 1
+            raise WhatsAppSendError('Falha simulada no provedor')
+        self.sent.append((phone_number, message))
+
+
+class RateLimiter:
+    def __init__(self, rate_per_second: float):
+        self.interval = 1 / rate_per_second if rate_per_second > 0 else 0
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        wait = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_rate_limiters: dict[str, RateLimiter] = {}
+
+
+def rate_limiter_for(provider: WhatsAppProvider, rate_per_second: float) -> RateLimiter:
+    limiter = _rate_limiters.get(provider.name)
+    if limiter is None or limiter.interval != (1 / rate_per_second if rate_per_second > 0 else 0):
+        limiter = _rate_limiters[provider.name] = RateLimiter(rate_per_second)
+    return limiter
+
+
+@dataclass
+class FanOutResult:
+    sent: int = 0
+    failed: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+
+
+async def fan_out(
+    provider: WhatsAppProvider,
+    recipients: AsyncIterator[tuple[int, str]],
+    message: str,
+    concurrency: int,
+    rate_per_second: float,
+    max_retries: int,
+    backoff_seconds: float,
+) -> FanOutResult:
+    result = FanOutResult()
+    limiter = rate_limiter_for(provider, rate_per_second)
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def deliver(client_id: int, phone_number: str):
+        try:
+            for attempt in range(max_retries + 1):
+                await limiter.acquire()
+                try:
+                    await provider.send(phone_number, message)
+                except WhatsAppSendError as error:
+                    if attempt == max_retries:
+                        result.failed.append({'id': client_id, 'reason': str(error)})
+                        return
+                    await asyncio.sleep(backoff_seconds * 2**attempt)
+                except Exception as error:  # noqa: BLE001
+                    # Anything but a provider rejection is unexpected: report it and let the caller decide.
+                    result.errors.append({'id': client_id, 'reason': f'{type(error).__name__}: {error}'})
+                    return
+                else:
+                    result.sent += 1
+                    return
+        finally:
+            slots.release()
+
+    # Taking the slot before creating the task keeps at most `concurrency` recipients in memory.
+    async for client_id, phone_number in recipients:
+        await slots.acquire()
+        task = asyncio.create_task(deliver(client_id, phone_number))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*tasks)
+    return result
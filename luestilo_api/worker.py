@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from itertools import groupby
+
+from sqlalchemy import and_, bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from luestilo_api.analytics import refresh_sales_rollups
+from luestilo_api.database import engine
+from luestilo_api.idempotency import purge_expired_idempotency_keys, utcnow
+from luestilo_api.inventory import compact_stock_movements
+from luestilo_api.models import BroadcastJob, BroadcastRecipient
+from luestilo_api.settings import Settings
+from luestilo_api.whatsapp import SimulatedWhatsAppProvider, WhatsAppProvider, fan_out
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+
+async def as_recipients(batch: list[tuple]):
+    for recipient_id, numero_whatsapp in batch:
+        yield recipient_id, numero_whatsapp
+
+
+def claim_broadcast_batch(session: Session, batch_size: int) -> list[tuple]:
+    # SKIP LOCKED lets any number of workers claim disjoint batches. The claim is committed before sending, so no
+    # row locks are held during network I/O; rows of a worker that died mid-batch stay 'sending' and are claimed
+    # again once BROADCAST_CLAIM_TIMEOUT_SECONDS has passed.
+    now = utcnow()
+    stale = now - timedelta(seconds=settings.BROADCAST_CLAIM_TIMEOUT_SECONDS)
+    recipients = session.scalars(
+        select(BroadcastRecipient)
+        .where(
+            or_(
+                BroadcastRecipient.status == 'pending',
+                and_(BroadcastRecipient.status == 'sending', BroadcastRecipient.claimed_at < stale),
+            )
+        )
+        .order_by(BroadcastRecipient.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    claimed = []
+    for recipient in recipients:
+        # Attempts count claims, so a recipient that keeps crashing the worker is eventually given up on.
+        if recipient.attempts >= settings.BROADCAST_MAX_ATTEMPTS:
+            recipient.status = 'failed'
+            recipient.error = recipient.error or 'Número máximo de tentativas atingido'
+            continue
+        recipient.attempts += 1
+        recipient.status = 'sending'
+        recipient.claimed_at = now
+        claimed.append((recipient.id, recipient.job_id, recipient.numero_whatsapp, recipient.attempts, now))
+
+    session.commit()
+    return claimed
+
+
+def process_broadcast_batch(session: Session, provider: WhatsAppProvider, batch_size: int) -> int:
+    claimed = claim_broadcast_batch(session, batch_size)
+    if not claimed:
+        return 0
+
+    messages = dict(
+        session.execute(
+            select(BroadcastJob.id, BroadcastJob.mensagem).where(
+                BroadcastJob.id.in_({job_id for _, job_id, *_ in claimed})
+            )
+        ).all()
+    )
+    session.rollback()
+
+    failures = {}
+    errors = {}
+    for job_id, job_claims in groupby(sorted(claimed, key=lambda r: r[1]), key=lambda r: r[1]):
+        job_recipients = [(recipient_id, numero_whatsapp) for recipient_id, _, numero_whatsapp, *_ in job_claims]
+        try:
+            result = asyncio.run(
+                fan_out(
+                    provider,
+                    as_recipients(job_recipients),
+                    messages[job_id],
+                    concurrency=settings.WHATSAPP_CONCURRENCY,
+                    rate_per_second=settings.WHATSAPP_RATE_PER_SECOND,
+                    max_retries=settings.WHATSAPP_MAX_RETRIES,
+                    backoff_seconds=settings.WHATSAPP_RETRY_BACKOFF_SECONDS,
+                )
+            )
+        except Exception as error:  # noqa: BLE001
+            errors.update({recipient_id: f'{type(error).__name__}: {error}' for recipient_id, _ in job_recipients})
+            continue
+        failures.update({failure['id']: failure['reason'] for failure in result.failed})
+        errors.update({error['id']: error['reason'] for error in result.errors})
+
+    outcomes = []
+    for recipient_id, _, _, attempts, claimed_at in claimed:
+        if recipient_id in failures:
+            status, error = 'failed', failures[recipient_id]
+        elif recipient_id in errors:
+            # Unexpected errors are retried by a later batch until the attempts run out.
+            status = 'failed' if attempts >= settings.BROADCAST_MAX_ATTEMPTS else 'pending'
+            error = errors[recipient_id]
+        else:
+            status, error = 'sent', None
+        outcomes.append({'recipient_id': recipient_id, 'claim': claimed_at, 'outcome': status, 'reason': error})
+
+    record_broadcast_outcomes(session, outcomes)
+    return len(claimed)
+
+
+def record_broadcast_outcomes(session: Session, outcomes: list[dict]):
+    # A worker that ran past BROADCAST_CLAIM_TIMEOUT_SECONDS may have had its rows claimed by another worker. Only
+    # rows still carrying this worker's claim are written; locking them first keeps them from being reclaimed
+    # between the check and the write.
+    still_claimed = set(
+        session.scalars(
+            select(BroadcastRecipient.id)
+            .where(
+                BroadcastRecipient.id.in_([outcome['recipient_id'] for outcome in outcomes]),
+                BroadcastRecipient.status == 'sending',
+                BroadcastRecipient.claimed_at.in_({outcome['claim'] for outcome in outcomes}),
+            )
+            .with_for_update()
+        )
+    )
+    lost = sorted(outcome['recipient_id'] for outcome in outcomes if outcome['recipient_id'] not in still_claimed)
+    if lost:
+        logger.warning('Claim on broadcast recipients %s was taken over by another worker; not recording them', lost)
+
+    recipients = BroadcastRecipient.__table__
+    owned = [outcome for outcome in outcomes if outcome['recipient_id'] in still_claimed]
+    if owned:
+        session.execute(
+            update(recipients)
+            .where(
+                recipients.c.id == bindparam('recipient_id'),
+                recipients.c.status == 'sending',
+                recipients.c.claimed_at == bindparam('claim'),
+            )
+            .values(status=bindparam('outcome'), error=bindparam('reason')),
+            owned,
+        )
+    session.commit()
+
+
+def run_worker(provider: WhatsAppProvider):
+    periodic_tasks = [
+        (refresh_sales_rollups, settings.SALES_ROLLUP_REFRESH_INTERVAL_SECONDS),
+        (compact_stock_movements, settings.STOCK_COMPACTION_INTERVAL_SECONDS),
+        (purge_expired_idempotency_keys, settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS),
+    ]
+    next_runs = [0.0] * len(periodic_tasks)
+    while True:
+        processed = 0
+        try:
+            with Session(engine) as session:
+                processed = process_broadcast_batch(session, provider, settings.BROADCAST_BATCH_SIZE)
+                for index, (task, interval) in enumerate(periodic_tasks):
+                    if time.monotonic() >= next_runs[index]:
+                        next_runs[index] = time.monotonic() + interval
+                        task(session)
+        except Exception:
+            # Keep the worker alive; claimed rows are retried once their claim times out.
+            logger.exception('Worker iteration failed')
+        if not processed:
+            time.sleep(settings.BROADCAST_POLL_INTERVAL_SECONDS)
+
+
+if __name__ == '__main__':
+    run_worker(SimulatedWhatsAppProvider())
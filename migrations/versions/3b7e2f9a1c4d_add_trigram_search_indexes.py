@@ -0,0 +1,47 @@
+"""Add trigram search indexes
+
+Revision ID: 3b7e2f9a1c4d
+Revises: ca1f6f057cb6
+Create Date: 2026-10-17 09:12:41.508311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e2f9a1c4d'
+down_revision: Union[str, None] = 'ca1f6f057cb6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    # unaccent() is only STABLE, so it can't back an index; this wrapper pins the dictionary and is IMMUTABLE.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+    op.create_index(
+        'ix_clients_name_trgm', 'clients', [sa.text('f_unaccent(name) gin_trgm_ops')], postgresql_using='gin'
+    )
+    op.create_index('ix_clients_email_trgm', 'clients', [sa.text('email gin_trgm_ops')], postgresql_using='gin')
+    op.create_index(
+        'ix_products_secao_trgm', 'products', [sa.text('f_unaccent(secao) gin_trgm_ops')], postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_secao_trgm', table_name='products')
+    op.drop_index('ix_clients_email_trgm', table_name='clients')
+    op.drop_index('ix_clients_name_trgm', table_name='clients')
+    op.execute('DROP FUNCTION IF EXISTS f_unaccent(text)')
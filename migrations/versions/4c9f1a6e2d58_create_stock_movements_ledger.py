@@ -0,0 +1,58 @@
+"""Create stock movements ledger
+
+Revision ID: 4c9f1a6e2d58
+Revises: e2b84d19c6a7
+Create Date: 2026-10-17 15:18:09.551730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c9f1a6e2d58'
+down_revision: Union[str, None] = 'e2b84d19c6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_movements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=20), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('compacted', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_movements_product_created', 'stock_movements', ['product_id', 'created_at'], unique=False)
+    op.create_index(
+        'ix_stock_movements_uncompacted',
+        'stock_movements',
+        ['product_id'],
+        unique=False,
+        postgresql_where=sa.text('NOT compacted'),
+    )
+    # History starts here: each product opens the ledger with its current stock, already compacted.
+    op.execute(
+        "INSERT INTO stock_movements (product_id, quantity, reason, compacted) "
+        "SELECT id, estoque_inicial, 'initial', true FROM products"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "UPDATE products SET estoque_inicial = estoque_inicial + COALESCE("
+        "(SELECT SUM(quantity) FROM stock_movements WHERE product_id = products.id AND NOT compacted), 0)"
+    )
+    op.drop_index('ix_stock_movements_uncompacted', table_name='stock_movements')
+    op.drop_index('ix_stock_movements_product_created', table_name='stock_movements')
+    op.drop_table('stock_movements')
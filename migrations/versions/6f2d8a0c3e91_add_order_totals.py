@@ -0,0 +1,56 @@
+"""Add order totals
+
+Revision ID: 6f2d8a0c3e91
+Revises: b81e0c4f7a93
+Create Date: 2026-10-17 19:12:48.530217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2d8a0c3e91'
+down_revision: Union[str, None] = 'b81e0c4f7a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('orders', sa.Column('total_amount', sa.Float(), server_default='0', nullable=False))
+    op.add_column('orders', sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE orders
+        SET total_amount = totals.total_amount, item_count = totals.item_count
+        FROM (
+            SELECT
+                order_id,
+                ROUND(CAST(SUM(quantity * price_at_order) AS NUMERIC), 2) AS total_amount,
+                SUM(quantity) AS item_count
+            FROM order_products
+            GROUP BY order_id
+        ) AS totals
+        WHERE orders.id = totals.order_id
+        """
+    )
+    # CONCURRENTLY keeps the tables writable while the indexes build, but can't run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_orders_active_total_amount',
+            'orders',
+            ['total_amount', 'id'],
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_active_total_amount', table_name='orders', postgresql_concurrently=True)
+    op.drop_column('orders', 'item_count')
+    op.drop_column('orders', 'total_amount')
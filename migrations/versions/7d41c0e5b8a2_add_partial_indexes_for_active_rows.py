@@ -0,0 +1,48 @@
+"""Add partial indexes for active rows
+
+Revision ID: 7d41c0e5b8a2
+Revises: 3b7e2f9a1c4d
+Create Date: 2026-10-17 10:03:17.224190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d41c0e5b8a2'
+down_revision: Union[str, None] = '3b7e2f9a1c4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_INDEXES = [
+    ('ix_clients_active_id', 'clients', ['id']),
+    ('ix_products_active_id', 'products', ['id']),
+    ('ix_products_active_secao_valor', 'products', ['secao', 'valor_de_venda']),
+    ('ix_orders_active_id', 'orders', ['id']),
+    ('ix_orders_active_client_periodo', 'orders', ['client_id', 'periodo']),
+    ('ix_orders_active_periodo', 'orders', ['periodo']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build, but can't run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in ACTIVE_INDEXES:
+            op.create_index(
+                name, table, columns, postgresql_where=sa.text('is_active'), postgresql_concurrently=True
+            )
+        op.create_index(
+            'ix_order_products_product_id', 'order_products', ['product_id'], postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_order_products_product_id', table_name='order_products', postgresql_concurrently=True)
+        for name, table, _ in reversed(ACTIVE_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
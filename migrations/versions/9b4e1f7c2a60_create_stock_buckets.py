@@ -0,0 +1,59 @@
+"""Create stock buckets
+
+Revision ID: 9b4e1f7c2a60
+Revises: d3a7c52e9f14
+Create Date: 2026-10-17 21:27:53.604871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e1f7c2a60'
+down_revision: Union[str, None] = 'd3a7c52e9f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match luestilo_api.inventory.STOCK_BUCKETS at the time of this migration.
+STOCK_BUCKETS = 8
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_buckets',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('available', sa.Integer(), nullable=False),
+    sa.CheckConstraint('available >= 0', name='ck_stock_buckets_available'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('product_id', 'bucket')
+    )
+    # Spread each product's live balance (compacted base plus pending movements) evenly over the buckets.
+    buckets = ' UNION ALL '.join(f'SELECT {bucket} AS bucket' for bucket in range(STOCK_BUCKETS))
+    op.execute(
+        f"""
+        INSERT INTO stock_buckets (product_id, bucket, available)
+        SELECT balances.id, buckets.bucket,
+               balances.estoque / {STOCK_BUCKETS}
+               + CASE WHEN buckets.bucket < balances.estoque % {STOCK_BUCKETS} THEN 1 ELSE 0 END
+        FROM (
+            SELECT live.id, CASE WHEN live.estoque > 0 THEN live.estoque ELSE 0 END AS estoque
+            FROM (
+                SELECT products.id, products.estoque_inicial + COALESCE(SUM(stock_movements.quantity), 0) AS estoque
+                FROM products
+                LEFT JOIN stock_movements
+                    ON stock_movements.product_id = products.id AND NOT stock_movements.compacted
+                GROUP BY products.id, products.estoque_inicial
+            ) AS live
+        ) AS balances
+        CROSS JOIN ({buckets}) AS buckets
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stock_buckets')
@@ -0,0 +1,56 @@
+"""Create broadcast job queue
+
+Revision ID: a5c93e17d4f0
+Revises: 7d41c0e5b8a2
+Create Date: 2026-10-17 11:26:05.873902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c93e17d4f0'
+down_revision: Union[str, None] = '7d41c0e5b8a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('broadcast_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('mensagem', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('broadcast_recipients',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('numero_whatsapp', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=10), server_default='pending', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['job_id'], ['broadcast_jobs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_broadcast_recipients_job_status', 'broadcast_recipients', ['job_id', 'status'], unique=False)
+    op.create_index(
+        'ix_broadcast_recipients_pending',
+        'broadcast_recipients',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_broadcast_recipients_pending', table_name='broadcast_recipients')
+    op.drop_index('ix_broadcast_recipients_job_status', table_name='broadcast_recipients')
+    op.drop_table('broadcast_recipients')
+    op.drop_table('broadcast_jobs')
@@ -0,0 +1,36 @@
+"""Add broadcast recipient claims
+
+Revision ID: d3a7c52e9f14
+Revises: 6f2d8a0c3e91
+Create Date: 2026-10-17 20:41:09.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7c52e9f14'
+down_revision: Union[str, None] = '6f2d8a0c3e91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('broadcast_recipients', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_broadcast_recipients_sending',
+        'broadcast_recipients',
+        ['claimed_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'sending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_broadcast_recipients_sending', table_name='broadcast_recipients')
+    op.drop_column('broadcast_recipients', 'claimed_at')
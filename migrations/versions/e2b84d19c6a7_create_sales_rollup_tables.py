@@ -0,0 +1,54 @@
+"""Create sales rollup tables
+
+Revision ID: e2b84d19c6a7
+Revises: a5c93e17d4f0
+Create Date: 2026-10-17 14:02:41.318265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b84d19c6a7'
+down_revision: Union[str, None] = 'a5c93e17d4f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_daily_products',
+    sa.Column('periodo', sa.Date(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('periodo', 'client_id', 'product_id')
+    )
+    op.create_table('sales_daily_clients',
+    sa.Column('periodo', sa.Date(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.PrimaryKeyConstraint('periodo', 'client_id')
+    )
+    op.create_table('sales_dirty_days',
+    sa.Column('periodo', sa.Date(), nullable=False),
+    sa.Column('marked_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('periodo')
+    )
+    # Every existing day starts dirty, so the first refresh backfills the rollups.
+    op.execute('INSERT INTO sales_dirty_days (periodo) SELECT DISTINCT periodo FROM orders')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sales_dirty_days')
+    op.drop_table('sales_daily_clients')
+    op.drop_table('sales_daily_products')
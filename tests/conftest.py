@@ -1,31 +1,126 @@
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
+from starlette.routing import Match
 
 from luestilo_api.app import app
-from luestilo_api.database import get_session
-from luestilo_api.models import Client, table_registry
+from luestilo_api.cache import MemoryCacheBackend
+from luestilo_api.catalog_cache import catalog_cache
+from luestilo_api.database import async_database_url, get_async_session, get_session
+from luestilo_api.models import Client, Product, User, table_registry
+from luestilo_api.security import create_access_token, get_password_hash, user_cache
+
+# Maximum SQL statements per request, including the user lookup on an auth cache miss. Budgets must not
+# depend on page size or item count, so an N+1 shows up as soon as a test sends more than one row.
+QUERY_BUDGETS = {
+    ('GET', '/clients/'): 2,
+    ('GET', '/clients/{client_id}'): 2,
+    ('POST', '/clients/'): 6,
+    ('GET', '/products/'): 2,
+    ('GET', '/products/{product_id}'): 2,
+    ('GET', '/orders/'): 4,
+    ('GET', '/orders/{order_id}'): 2,
+    # Includes the stock reservation fallback (lock and rewrite the buckets) taken when the picked bucket is low.
+    ('POST', '/orders/'): 16,
+}
+
+
+def route_template(method: str, url) -> str | None:
+    scope = {'type': 'http', 'method': method.upper(), 'path': urlsplit(str(url)).path, 'root_path': ''}
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return None
+
+
+def budget_failure(label: str, budget: int, statements: list[str]) -> str:
+    listing = '\n'.join(f'  {index}. {statement}' for index, statement in enumerate(statements, start=1))
+    return f'{label} ran {len(statements)} queries, budget is {budget}:\n{listing}'
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(' '.join(statement.split()))
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self.record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self.record)
+
+
+class BudgetedTestClient(TestClient):
+    def __init__(self, *args, query_counter: QueryCounter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query_counter = query_counter
+
+    def request(self, method, url, *args, **kwargs):
+        start = len(self.query_counter.statements)
+        response = super().request(method, url, *args, **kwargs)
+        route = route_template(method, url)
+        budget = QUERY_BUDGETS.get((method.upper(), route))
+        statements = self.query_counter.statements[start:]
+        if budget is not None and len(statements) > budget:
+            pytest.fail(budget_failure(f'{method.upper()} {route}', budget, statements))
+        return response
 
 
 @pytest.fixture
 def client(session):
+    # Async handlers read the same SQLite file through aiosqlite; NullPool keeps connections on the client's loop.
+    async_engine = create_async_engine(
+        async_database_url(session.get_bind().url.render_as_string(hide_password=False)), poolclass=NullPool
+    )
+
     def get_session_override():
         return session
 
-    with TestClient(app) as client:
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
+
+    with (
+        QueryCounter(session.get_bind()) as query_counter,
+        BudgetedTestClient(app, query_counter=query_counter) as client,
+    ):
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_async_session] = get_async_session_override
 
         yield client
 
     app.dependency_overrides.clear()
+    user_cache.clear()
+    catalog_cache.backend = MemoryCacheBackend(maxsize=128, ttl=catalog_cache.ttl)
+
+
+@pytest.fixture
+def query_budget(session):
+    @contextmanager
+    def check(budget: int):
+        with QueryCounter(session.get_bind()) as query_counter:
+            yield query_counter.statements
+        if len(query_counter.statements) > budget:
+            pytest.fail(budget_failure('Block', budget, query_counter.statements))
+
+    return check
 
 
 @pytest.fixture
-def session():
+def session(tmp_path):
     engine = create_engine(
-        'sqlite:///:memory:',
+        f'sqlite:///{tmp_path / "test.db"}',
         connect_args={'check_same_thread': False},
         poolclass=StaticPool,
     )
@@ -46,3 +141,47 @@ def cliente(session: Session):
     session.refresh(cliente)
 
     return cliente
+
+
+@pytest.fixture
+def product(session: Session):
+    product = Product(
+        descricao='Camiseta Algodão Branca M',
+        valor_de_venda=59.99,
+        codigo_de_barras='7891234567890',
+        secao='Vestuário Feminino',
+        estoque_inicial=10,
+        data_validade=None,
+    )
+    session.add(product)
+    session.commit()
+    session.refresh(product)
+
+    return product
+
+
+@pytest.fixture
+def user(session: Session):
+    password = 'testtest'
+    user = User(
+        username='teste',
+        email='teste@test.com',
+        password=get_password_hash(password),
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+    user.clean_password = password
+
+    return user
+
+
+@pytest.fixture
+def token(user):
+    return create_access_token(data={'sub': user.username, 'id': user.id})
+
+
+@pytest.fixture
+def auth_headers(token):
+    return {'Authorization': f'Bearer {token}'}
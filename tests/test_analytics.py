@@ -0,0 +1,80 @@
+from datetime import date
+from http import HTTPStatus
+
+from luestilo_api.models import OrderProduct, Product
+
+
+def place_order(client, auth_headers, client_id, periodo, items):
+    response = client.post(
+        '/orders/',
+        headers=auth_headers,
+        json={'client_id': client_id, 'status': 'pendente', 'periodo': str(periodo), 'items': items},
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    return response.json()
+
+
+def test_sales_analytics_from_rollups(client, session, cliente, product, auth_headers):
+    other_product = Product(
+        descricao='Calça Jeans 42',
+        valor_de_venda=100.0,
+        codigo_de_barras='7890000000001',
+        secao='Vestuário Masculino',
+        estoque_inicial=10,
+        data_validade=None,
+    )
+    session.add(other_product)
+    session.commit()
+
+    may_items = [{'product_id': product.id, 'quantity': 2, 'price_at_order': 50.0}]
+    june_items = [
+        {'product_id': product.id, 'quantity': 1, 'price_at_order': 50.0},
+        {'product_id': other_product.id, 'quantity': 1},
+    ]
+    place_order(client, auth_headers, cliente.id, date(2025, 5, 1), may_items)
+    place_order(client, auth_headers, cliente.id, date(2025, 6, 1), june_items)
+
+    assert client.get('/analytics/average-ticket', headers=auth_headers).json()['order_count'] == 0
+    assert client.post('/analytics/refresh', headers=auth_headers).json() == {'refreshed_days': 2}
+
+    by_month = client.get('/analytics/revenue?group_by=month', headers=auth_headers).json()
+    by_secao = client.get('/analytics/revenue?group_by=secao', headers=auth_headers).json()
+    top = client.get('/analytics/top-products?order_by=quantity', headers=auth_headers).json()
+    ticket = client.get('/analytics/average-ticket', headers=auth_headers).json()
+
+    assert [(bucket['key'], bucket['revenue']) for bucket in by_month['buckets']] == [
+        ('2025-05', 100.0),
+        ('2025-06', 150.0),
+    ]
+    assert {bucket['key']: bucket['revenue'] for bucket in by_secao['buckets']} == {
+        'Vestuário Feminino': 150.0,
+        'Vestuário Masculino': 100.0,
+    }
+    assert [item['product_id'] for item in top['products']] == [product.id, other_product.id]
+    assert ticket == {'order_count': 2, 'revenue': 250.0, 'average_ticket': 125.0}
+
+
+def test_deleting_order_refreshes_only_its_day(client, cliente, product, auth_headers):
+    order = place_order(client, auth_headers, cliente.id, date(2025, 5, 1), [{'product_id': product.id, 'quantity': 1}])
+    place_order(client, auth_headers, cliente.id, date(2025, 5, 2), [{'product_id': product.id, 'quantity': 1}])
+    client.post('/analytics/refresh', headers=auth_headers)
+
+    client.delete(f'/orders/{order["id"]}', headers=auth_headers)
+
+    assert client.post('/analytics/refresh', headers=auth_headers).json() == {'refreshed_days': 1}
+    assert client.post('/analytics/refresh', headers=auth_headers).json() == {'refreshed_days': 0}
+    by_day = client.get('/analytics/revenue?group_by=day', headers=auth_headers).json()
+    assert [bucket['key'] for bucket in by_day['buckets']] == ['2025-05-02']
+
+
+def test_changing_order_line_marks_its_day_dirty(client, session, cliente, product, auth_headers):
+    order = place_order(client, auth_headers, cliente.id, date(2025, 5, 1), [{'product_id': product.id, 'quantity': 1}])
+    client.post('/analytics/refresh', headers=auth_headers)
+
+    line = session.get(OrderProduct, (order['id'], product.id))
+    line.quantity = 3
+    session.commit()
+
+    assert client.post('/analytics/refresh', headers=auth_headers).json() == {'refreshed_days': 1}
+    by_day = client.get('/analytics/revenue?group_by=day', headers=auth_headers).json()
+    assert [bucket['quantity'] for bucket in by_day['buckets']] == [3]
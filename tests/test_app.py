@@ -30,13 +30,13 @@ def test_create_clients(client):
 def test_read_clients(client):
     response = client.get('/clients')
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'clients': []}
+    assert response.json() == {'clients': [], 'next_cursor': None}
 
 
 def test_read_clients_with_clients(client, cliente):
     client_schema = ClientPublic.model_validate(cliente).model_dump()
     response = client.get('/clients/')
-    assert response.json() == {'clients': [client_schema]}
+    assert response.json() == {'clients': [client_schema], 'next_cursor': None}
 
 
 def test_update_user(client, cliente):
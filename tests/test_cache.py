@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+from sqlalchemy import update
+
+from luestilo_api.cache import TTLCache
+from luestilo_api.models import User
+from luestilo_api.security import user_cache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_ttl_cache_does_not_store_expired_entries():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1, ttl=0)
+
+    assert cache.get('a') is None
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'size': 0, 'maxsize': 2}
+
+
+def test_get_current_user_is_served_from_cache(client, auth_headers):
+    client.get('/clients/', headers=auth_headers)
+    client.get('/clients/', headers=auth_headers)
+
+    response = client.get('/metrics/cache', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['misses'] == 1
+    assert response.json()['hits'] == 2  # noqa: PLR2004
+
+
+def test_updating_user_invalidates_cached_principal(client, session, user, auth_headers):
+    client.get('/clients/', headers=auth_headers)
+    assert user_cache.stats()['size'] == 1
+
+    user.email = 'novo@test.com'
+    session.commit()
+
+    assert user_cache.stats()['size'] == 0
+
+
+def test_bulk_user_update_invalidates_cached_principals(client, session, user, auth_headers):
+    client.get('/clients/', headers=auth_headers)
+    assert user_cache.stats()['size'] == 1
+
+    session.execute(update(User).where(User.id == user.id).values(email='novo@test.com'))
+    session.commit()
+
+    assert user_cache.stats()['size'] == 0
@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+from luestilo_api.cache import MemoryCacheBackend, RedisCacheBackend
+from luestilo_api.catalog_cache import CatalogCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b'0')) + 1).encode()
+        return int(self.data[key])
+
+
+def test_catalog_cache_normalizes_filters_and_retires_list_pages():
+    cache = CatalogCache(RedisCacheBackend(FakeRedis()), ttl=60)
+    key = cache.list_key({'secao': ' Vestuário ', 'min_price': None, 'limit': 10})
+
+    assert key == cache.list_key({'limit': 10, 'secao': 'vestuario'})
+
+    etag, body = cache.set(key, b'{"products":[]}')
+    cache.set(cache.product_key(1), b'{}')
+    assert cache.get(key) == (etag, body)
+
+    cache.invalidate_products([1])
+
+    assert cache.get(cache.product_key(1)) is None
+    assert cache.list_key({'secao': 'vestuario', 'limit': 10}) != key
+
+
+def test_detail_read_started_before_a_write_cannot_store_a_stale_entry():
+    cache = CatalogCache(RedisCacheBackend(FakeRedis()), ttl=60)
+    key = cache.product_key(1)
+
+    cache.invalidate_products([1])
+    cache.set(key, b'{"valor_de_venda": 59.99}')
+
+    assert cache.get(cache.product_key(1)) is None
+
+
+def test_memory_backend_bounds_version_counters_without_reusing_versions():
+    backend = MemoryCacheBackend(maxsize=2, ttl=60)
+    first = backend.incr('catalog:product:1:version')
+    for product_id in range(2, 10):
+        backend.incr(f'catalog:product:{product_id}:version')
+
+    assert backend.get('catalog:product:1:version') is None
+    assert backend.incr('catalog:product:1:version') > first
+
+
+def test_read_products_revalidates_with_etag(client, product, auth_headers):
+    response = client.get('/products/', headers=auth_headers)
+    etag = response.headers['etag']
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['products'][0]['id'] == product.id
+
+    response = client.get('/products/', headers={**auth_headers, 'If-None-Match': etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+
+
+def test_product_writes_invalidate_cached_reads(client, product, auth_headers):
+    etag = client.get(f'/products/{product.id}', headers=auth_headers).headers['etag']
+    client.get('/products/', headers=auth_headers)
+
+    client.put(
+        f'/products/{product.id}',
+        headers=auth_headers,
+        json={
+            'descricao': product.descricao,
+            'valor_de_venda': 49.99,
+            'codigo_de_barras': product.codigo_de_barras,
+            'secao': product.secao,
+            'estoque_inicial': product.estoque_inicial,
+            'imagens': [],
+        },
+    )
+
+    response = client.get(f'/products/{product.id}', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['valor_de_venda'] == 49.99  # noqa: PLR2004
+    assert client.get('/products/', headers=auth_headers).json()['products'][0]['valor_de_venda'] == 49.99  # noqa: PLR2004
+
+
+def test_create_order_invalidates_cached_stock(client, cliente, product, auth_headers):
+    client.get(f'/products/{product.id}', headers=auth_headers)
+
+    client.post(
+        '/orders/',
+        headers=auth_headers,
+        json={
+            'client_id': cliente.id,
+            'status': 'pendente',
+            'periodo': '2025-05-26',
+            'items': [{'product_id': product.id, 'quantity': 4}],
+        },
+    )
+
+    assert client.get(f'/products/{product.id}', headers=auth_headers).json()['estoque_inicial'] == 6  # noqa: PLR2004
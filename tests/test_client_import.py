@@ -0,0 +1,41 @@
+from http import HTTPStatus
+
+
+def test_import_clients_reports_each_row(client, cliente, auth_headers):
+    response = client.post(
+        '/clients/import',
+        headers=auth_headers,
+        json=[
+            {'name': 'Maria', 'cpf': '125.242.550-34', 'email': 'maria@test.com'},
+            {'name': 'Repetido', 'cpf': cliente.cpf, 'email': 'outro@test.com'},
+            {'name': 'Inválido', 'cpf': '111', 'email': 'invalido@test.com'},
+            {'name': 'Duplicado na lista', 'cpf': '125.242.550-34', 'email': 'dup@test.com'},
+        ],
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    report = response.json()
+    assert (report['created'], report['conflicts'], report['invalid']) == (1, 2, 1)
+    assert [result['status'] for result in report['results']] == ['created', 'conflict', 'invalid', 'conflict']
+    assert report['results'][1]['detail'] == 'CPF already exists'
+    assert report['results'][2]['detail'].startswith('cpf:')
+
+
+def test_import_clients_from_csv(client, auth_headers):
+    content = (
+        'name,cpf,email,numero_whatsapp,aceita_notificacoes_whatsapp\n'
+        'Maria,125.242.550-34,maria@test.com,+5535991234567,true\n'
+        'Joana,916.678.060-84,joana@test.com,,\n'
+    )
+
+    response = client.post(
+        '/clients/import/csv',
+        headers=auth_headers,
+        files={'file': ('clients.csv', content, 'text/csv')},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['created'] == 2  # noqa: PLR2004
+
+    clients = client.get('/clients/', headers=auth_headers).json()['clients']
+    assert [(c['name'], c['aceita_notificacoes_whatsapp']) for c in clients] == [('Maria', True), ('Joana', False)]
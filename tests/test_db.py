@@ -1,5 +1,10 @@
+import asyncio
+from http import HTTPStatus
+
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from luestilo_api.database import get_async_engine, get_async_session
 from luestilo_api.models import Client
 
 
@@ -13,3 +18,26 @@ def test_create_client(session):
 
     client = session.scalar(select(Client).where(Client.name == 'test'))
     assert client.name == 'test'
+
+
+def test_get_async_session_yields_async_session():
+    async def first_session():
+        sessions = get_async_session()
+        session = await anext(sessions)
+        await sessions.aclose()
+        return session
+
+    session = asyncio.run(first_session())
+
+    assert isinstance(session, AsyncSession)
+    assert session.bind is get_async_engine()
+
+
+def test_read_users_me_queries_through_async_session(client, user, auth_headers):
+    start = len(client.query_counter.statements)
+
+    response = client.get('/users/me', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'id': user.id, 'username': user.username, 'email': user.email}
+    assert client.query_counter.statements[start:] == []
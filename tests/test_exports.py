@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from datetime import date
+from http import HTTPStatus
+
+from luestilo_api.models import Order, OrderProduct
+
+
+def test_export_clients_as_ndjson(client, cliente, auth_headers):
+    response = client.get('/exports/clients', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [{
+        'id': cliente.id,
+        'name': cliente.name,
+        'cpf': cliente.cpf,
+        'email': cliente.email,
+        'is_active': True,
+        'numero_whatsapp': None,
+        'aceita_notificacoes_whatsapp': False,
+    }]
+
+
+def test_export_products_as_csv(client, product, auth_headers):
+    response = client.get('/exports/products', headers=auth_headers, params={'format': 'csv'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/csv')
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]['codigo_de_barras'] == product.codigo_de_barras
+    assert rows[0]['imagens'] == '[]'
+
+
+def test_export_orders_streams_one_row_per_item(client, session, cliente, product, auth_headers):
+    order = Order(status='pendente', periodo=date(2025, 5, 26), client_id=cliente.id)
+    session.add(order)
+    session.flush()
+    session.add(OrderProduct(order_id=order.id, product_id=product.id, quantity=2, price_at_order=59.99))
+    session.commit()
+
+    response = client.get('/exports/orders', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [{
+        'order_id': order.id,
+        'client_id': cliente.id,
+        'status': 'pendente',
+        'periodo': '2025-05-26',
+        'is_active': True,
+        'product_id': product.id,
+        'quantity': 2,
+        'price_at_order': 59.99,
+    }]
@@ -0,0 +1,45 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from luestilo_api.hashing import HashingPool
+from luestilo_api.security import hashing_pool
+
+
+def test_hashing_pool_rejects_when_saturated():
+    pool = HashingPool(max_workers=1, max_pending=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_hash():
+        started.set()
+        release.wait()
+        return 'hashed'
+
+    worker = threading.Thread(target=pool.run, args=('hash', slow_hash))
+    worker.start()
+    started.wait()
+
+    with pytest.raises(HTTPException) as exc_info:
+        pool.run('hash', slow_hash)
+
+    release.set()
+    worker.join()
+
+    assert exc_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert pool.stats()['rejected'] == 1
+    assert pool.stats()['latency']['hash']['count'] == 1
+
+
+def test_login_records_verify_latency(client, user):
+    verify_count = hashing_pool.stats()['latency']['verify']['count']
+
+    response = client.post(
+        '/token',
+        data={'username': user.username, 'password': user.clean_password},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert hashing_pool.stats()['latency']['verify']['count'] == verify_count + 1
@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+from http import HTTPStatus
+
+from sqlalchemy import func, select, update
+
+from luestilo_api.idempotency import purge_expired_idempotency_keys, utcnow
+from luestilo_api.models import IdempotencyKey, Order, StockMovement
+
+
+def order_payload(cliente, product, quantity=1):
+    return {
+        'client_id': cliente.id,
+        'status': 'pendente',
+        'periodo': str(date(2025, 5, 26)),
+        'items': [{'product_id': product.id, 'quantity': quantity}],
+    }
+
+
+def test_retried_order_is_replayed_without_writing_again(client, session, cliente, product, auth_headers):
+    headers = {**auth_headers, 'Idempotency-Key': 'pedido-123'}
+
+    first = client.post('/orders/', headers=headers, json=order_payload(cliente, product))
+    retry = client.post('/orders/', headers=headers, json=order_payload(cliente, product))
+
+    assert first.status_code == retry.status_code == HTTPStatus.CREATED
+    assert retry.json() == first.json()
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert session.scalar(select(func.count()).select_from(Order)) == 1
+    assert session.scalar(select(func.count()).where(StockMovement.reason == 'order')) == 1
+
+
+def test_reusing_key_with_other_body_is_rejected(client, cliente, product, auth_headers):
+    headers = {**auth_headers, 'Idempotency-Key': 'pedido-123'}
+    client.post('/orders/', headers=headers, json=order_payload(cliente, product))
+
+    response = client.post('/orders/', headers=headers, json=order_payload(cliente, product, quantity=2))
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_failed_request_releases_key(client, session, cliente, product, auth_headers):
+    headers = {**auth_headers, 'Idempotency-Key': 'pedido-123'}
+
+    rejected = client.post('/orders/', headers=headers, json=order_payload(cliente, product, quantity=99))
+    # The app closes each request's session, rolling back the key claim; the test client shares one session.
+    session.rollback()
+    retried = client.post('/orders/', headers=headers, json=order_payload(cliente, product, quantity=99))
+
+    assert rejected.status_code == retried.status_code == HTTPStatus.BAD_REQUEST
+    assert 'Idempotent-Replayed' not in retried.headers
+
+
+def test_expired_keys_are_reclaimed_and_purged(client, session, auth_headers):
+    headers = {**auth_headers, 'Idempotency-Key': 'cliente-1'}
+    payload = {'name': 'Maria', 'cpf': '52998224725', 'email': 'maria@example.com'}
+    assert client.post('/clients/', headers=headers, json=payload).status_code == HTTPStatus.CREATED
+
+    session.execute(update(IdempotencyKey).values(expires_at=utcnow() - timedelta(seconds=1)))
+    session.commit()
+
+    assert client.post('/clients/', headers=headers, json=payload).status_code == HTTPStatus.CONFLICT
+    assert purge_expired_idempotency_keys(session) == 0
+
+    session.execute(update(IdempotencyKey).values(expires_at=utcnow() - timedelta(seconds=1)))
+    session.commit()
+    assert purge_expired_idempotency_keys(session) == 1
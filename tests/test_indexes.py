@@ -0,0 +1,45 @@
+import re
+
+import pytest
+from sqlalchemy import event
+
+
+def query_plans(session, client, url, headers, table):
+    engine = session.get_bind()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith('SELECT') and f'FROM {table}' in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        client.get(url, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+
+    with engine.connect() as connection:
+        return [
+            ' '.join(row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters))
+            for statement, parameters in statements
+        ]
+
+
+@pytest.mark.parametrize(
+    ('url', 'table'),
+    [
+        ('/clients/', 'clients'),
+        ('/clients/?after=WzEwXQ==', 'clients'),
+        ('/products/?min_price=10', 'products'),
+        ('/products/?secao=Vestu%C3%A1rio&min_price=10', 'products'),
+        ('/orders/', 'orders'),
+        ('/orders/?client_id=1&start_periodo=2025-01-01', 'orders'),
+    ],
+)
+def test_list_queries_use_an_index(session, client, auth_headers, url, table):
+    plans = query_plans(session, client, url, auth_headers, table)
+
+    assert plans
+    for plan in plans:
+        assert not re.search(rf'SCAN {table}(?! USING)', plan), plan
+        assert re.search(rf'(SCAN|SEARCH) {table} USING', plan), plan
@@ -0,0 +1,120 @@
+from datetime import date, datetime
+from http import HTTPStatus
+
+from sqlalchemy import func, insert, select
+
+from luestilo_api.inventory import STOCK_BUCKETS, compact_stock_movements, reserve_stock, stock_at
+from luestilo_api.models import Product, StockBucket, StockMovement
+
+
+def test_orders_append_movements_and_compaction_keeps_stock(client, session, cliente, product, auth_headers):
+    response = client.post(
+        '/orders/',
+        headers=auth_headers,
+        json={
+            'client_id': cliente.id,
+            'status': 'pendente',
+            'periodo': str(date(2025, 5, 26)),
+            'items': [{'product_id': product.id, 'quantity': 3}],
+        },
+    )
+    client.patch(f'/products/products/{product.id}/reactivate?quantity_to_add=5', headers=auth_headers)
+
+    session.refresh(product)
+    assert response.status_code == HTTPStatus.CREATED
+    assert product.estoque_inicial == 10  # noqa: PLR2004
+    assert product.estoque == 12  # noqa: PLR2004
+
+    assert compact_stock_movements(session) == 2  # noqa: PLR2004
+    session.refresh(product)
+    assert product.estoque_inicial == 12  # noqa: PLR2004
+    assert product.estoque == 12  # noqa: PLR2004
+
+    movements = client.get(f'/products/{product.id}/stock/movements', headers=auth_headers).json()['movements']
+    assert [(movement['reason'], movement['quantity']) for movement in movements] == [
+        ('restock', 5),
+        ('order', -3),
+        ('initial', 10),
+    ]
+
+
+def test_setting_stock_records_adjustment(client, session, product, auth_headers):
+    payload = {
+        'descricao': product.descricao,
+        'valor_de_venda': product.valor_de_venda,
+        'codigo_de_barras': product.codigo_de_barras,
+        'secao': product.secao,
+        'estoque_inicial': 4,
+    }
+
+    response = client.put(f'/products/{product.id}', headers=auth_headers, json=payload)
+
+    assert response.json()['estoque_inicial'] == 4  # noqa: PLR2004
+    adjustment = session.scalar(
+        select(StockMovement).where(StockMovement.product_id == product.id, StockMovement.reason == 'adjustment')
+    )
+    assert (adjustment.reason, adjustment.quantity) == ('adjustment', -6)
+
+
+def test_products_added_through_the_session_open_their_ledger(session):
+    product = Product(
+        descricao='Meia Esportiva',
+        valor_de_venda=19.9,
+        codigo_de_barras='7890000000099',
+        secao='Acessórios',
+        estoque_inicial=7,
+        data_validade=None,
+    )
+    session.add(product)
+    session.commit()
+
+    buckets = session.scalars(select(StockBucket.available).where(StockBucket.product_id == product.id)).all()
+    assert sum(buckets) == 7  # noqa: PLR2004
+    assert stock_at(session, product.id, datetime(2100, 1, 1)) == 7  # noqa: PLR2004
+
+
+def test_stock_at_sums_movements_up_to_moment(client, session, product, auth_headers):
+    session.execute(
+        insert(StockMovement),
+        [
+            {'product_id': product.id, 'quantity': 10, 'reason': 'initial', 'created_at': datetime(2025, 1, 1)},
+            {'product_id': product.id, 'quantity': -4, 'reason': 'order', 'created_at': datetime(2025, 2, 1)},
+            {'product_id': product.id, 'quantity': 6, 'reason': 'restock', 'created_at': datetime(2025, 3, 1)},
+        ],
+    )
+    session.commit()
+
+    assert stock_at(session, product.id, datetime(2025, 2, 15)) == 6  # noqa: PLR2004
+    response = client.get(f'/products/{product.id}/stock?at=2025-01-15T00:00:00', headers=auth_headers)
+    assert response.json()['estoque'] == 10  # noqa: PLR2004
+
+
+def test_reservations_never_take_more_than_the_buckets_hold(session, product):
+    assert reserve_stock(session, {product.id: 7}) == {}
+    assert reserve_stock(session, {product.id: 4}) == {product.id: 3}
+
+    buckets = session.scalars(select(StockBucket.available).where(StockBucket.product_id == product.id)).all()
+    assert len(buckets) == STOCK_BUCKETS
+    assert sum(buckets) == 3  # noqa: PLR2004
+
+
+def test_fallback_reserves_every_product_after_releasing_the_fast_path(session, product):
+    other = Product(
+        descricao='Meia Social',
+        valor_de_venda=15.0,
+        codigo_de_barras='7890000000098',
+        secao='Acessórios',
+        estoque_inicial=16,
+        data_validade=None,
+    )
+    session.add(other)
+    session.commit()
+
+    assert reserve_stock(session, {product.id: 7, other.id: 1}) == {}
+
+    totals = dict(
+        session.execute(
+            select(StockBucket.product_id, func.sum(StockBucket.available)).group_by(StockBucket.product_id)
+        ).all()
+    )
+    assert totals == {product.id: 3, other.id: 15}
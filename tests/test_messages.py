@@ -0,0 +1,166 @@
+import asyncio
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from luestilo_api import worker
+from luestilo_api.idempotency import utcnow
+from luestilo_api.models import BroadcastJob, BroadcastRecipient, Client
+from luestilo_api.whatsapp import FakeWhatsAppProvider, fan_out
+
+
+@pytest.fixture
+def whatsapp(monkeypatch):
+    monkeypatch.setattr(worker.settings, 'WHATSAPP_RETRY_BACKOFF_SECONDS', 0)
+    return FakeWhatsAppProvider(failures={'+5511000000001': 1, '+5511000000002': 10})
+
+
+def test_send_to_all_clients_enqueues_a_job_processed_by_workers(client, session, whatsapp, auth_headers):
+    session.add_all([
+        Client(
+            name=f'cliente {index}',
+            email=f'cliente{index}@test.com',
+            cpf=f'000.000.000-{index:02d}',
+            numero_whatsapp=f'+551100000000{index}',
+            aceita_notificacoes_whatsapp=index != 4,  # noqa: PLR2004
+        )
+        for index in range(5)
+    ])
+    session.commit()
+
+    response = client.post('/send_to_all_clients', headers=auth_headers, json={'mensagem': 'Promoção!'})
+
+    assert response.status_code == HTTPStatus.ACCEPTED
+    job_id = response.json()['job_id']
+    assert response.json()['total_eligible'] == 4  # noqa: PLR2004
+    assert whatsapp.sent == []
+
+    assert worker.process_broadcast_batch(session, whatsapp, batch_size=3) == 3  # noqa: PLR2004
+    progress = client.get(f'/jobs/{job_id}', headers=auth_headers).json()
+    assert (progress['sent'], progress['failed'], progress['pending']) == (2, 1, 1)
+
+    assert worker.process_broadcast_batch(session, whatsapp, batch_size=3) == 1
+    assert worker.process_broadcast_batch(session, whatsapp, batch_size=3) == 0
+
+    progress = client.get(f'/jobs/{job_id}', headers=auth_headers).json()
+    assert (progress['total'], progress['sent'], progress['failed'], progress['pending']) == (4, 3, 1, 0)
+    assert whatsapp.attempts['+5511000000001'] == 2  # noqa: PLR2004
+    assert sorted(phone for phone, _ in whatsapp.sent) == ['+5511000000000', '+5511000000001', '+5511000000003']
+
+
+def test_unexpected_send_errors_are_retried_until_attempts_run_out(session, whatsapp, monkeypatch):
+    monkeypatch.setattr(worker.settings, 'BROADCAST_MAX_ATTEMPTS', 2)
+
+    class BrokenProvider:
+        name = 'broken'
+
+        async def send(self, phone_number, message):
+            raise RuntimeError('conexão recusada')
+
+    cliente = Client(name='cliente', email='cliente@test.com', cpf='000.000.000-00', numero_whatsapp='+5511000000000')
+    job = BroadcastJob(mensagem='Promoção!')
+    session.add_all([cliente, job])
+    session.flush()
+    recipient = BroadcastRecipient(job_id=job.id, client_id=cliente.id, numero_whatsapp=cliente.numero_whatsapp)
+    session.add(recipient)
+    session.commit()
+
+    assert worker.process_broadcast_batch(session, BrokenProvider(), batch_size=10) == 1
+    session.refresh(recipient)
+    assert (recipient.status, recipient.attempts) == ('pending', 1)
+    assert recipient.error == 'RuntimeError: conexão recusada'
+
+    worker.process_broadcast_batch(session, BrokenProvider(), batch_size=10)
+    session.refresh(recipient)
+    assert (recipient.status, recipient.attempts) == ('failed', 2)
+
+
+def test_stale_claims_are_picked_up_again(session, whatsapp):
+    cliente = Client(name='cliente', email='cliente@test.com', cpf='000.000.000-00', numero_whatsapp='+5511000000000')
+    job = BroadcastJob(mensagem='Promoção!')
+    session.add_all([cliente, job])
+    session.flush()
+    recipient = BroadcastRecipient(job_id=job.id, client_id=cliente.id, numero_whatsapp=cliente.numero_whatsapp)
+    session.add(recipient)
+    session.commit()
+
+    claimed = worker.claim_broadcast_batch(session, batch_size=10)
+    assert [claim[:4] for claim in claimed] == [(recipient.id, job.id, '+5511000000000', 1)]
+    assert worker.claim_broadcast_batch(session, batch_size=10) == []
+
+    recipient.claimed_at -= timedelta(seconds=worker.settings.BROADCAST_CLAIM_TIMEOUT_SECONDS + 1)
+    session.commit()
+
+    assert worker.process_broadcast_batch(session, whatsapp, batch_size=10) == 1
+    session.refresh(recipient)
+    assert (recipient.status, recipient.attempts) == ('sent', 2)
+
+
+def test_outcome_is_not_written_over_a_claim_taken_by_another_worker(session, whatsapp):
+    cliente = Client(name='cliente', email='cliente@test.com', cpf='000.000.000-00', numero_whatsapp='+5511000000000')
+    job = BroadcastJob(mensagem='Promoção!')
+    session.add_all([cliente, job])
+    session.flush()
+    recipient = BroadcastRecipient(job_id=job.id, client_id=cliente.id, numero_whatsapp=cliente.numero_whatsapp)
+    session.add(recipient)
+    session.commit()
+
+    class SlowProvider:
+        name = 'slow'
+
+        async def send(self, phone_number, message):
+            # The claim times out mid-send and a second worker takes the row over.
+            with Session(session.get_bind()) as other_worker:
+                other_worker.execute(
+                    update(BroadcastRecipient)
+                    .where(BroadcastRecipient.id == recipient.id)
+                    .values(claimed_at=utcnow() + timedelta(seconds=1), attempts=BroadcastRecipient.attempts + 1)
+                )
+                other_worker.commit()
+
+    assert worker.process_broadcast_batch(session, SlowProvider(), batch_size=10) == 1
+    session.refresh(recipient)
+    assert (recipient.status, recipient.attempts) == ('sending', 2)
+
+
+def test_read_unknown_job(client, auth_headers):
+    response = client.get('/jobs/999', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_fan_out_respects_concurrency_limit():
+    in_flight = 0
+    peak = 0
+
+    class SlowProvider:
+        name = 'slow'
+
+        async def send(self, phone_number, message):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def recipients():
+        for index in range(20):
+            yield index, f'+55110000{index:04d}'
+
+    result = asyncio.run(
+        fan_out(
+            SlowProvider(),
+            recipients(),
+            'Olá',
+            concurrency=3,
+            rate_per_second=0,
+            max_retries=0,
+            backoff_seconds=0,
+        )
+    )
+
+    assert result.sent == 20  # noqa: PLR2004
+    assert peak == 3  # noqa: PLR2004
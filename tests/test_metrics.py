@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from luestilo_api import database
+from luestilo_api.database import ReplicaPool, TimedQueuePool, instrument_pool, pool_metrics, settings
+
+
+def test_pool_events_record_checkouts_and_hold_time():
+    engine = create_engine('sqlite://', poolclass=QueuePool, pool_size=1)
+    instrument_pool('test', engine.pool)
+
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+
+    metrics = pool_metrics.pop('test')
+    assert metrics.checkouts == 2  # noqa: PLR2004
+    assert metrics.connects == 1
+    assert metrics.held.count == 2  # noqa: PLR2004
+
+
+def test_exhausted_pool_records_wait_and_timeout():
+    engine = create_engine('sqlite://', poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    instrument_pool('test', engine.pool)
+
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    metrics = pool_metrics.pop('test')
+    assert metrics.timeouts == 1
+    assert metrics.wait.count == 2  # noqa: PLR2004
+    assert metrics.wait.sum >= 0.05  # noqa: PLR2004
+
+
+def test_read_pool_stats(client, auth_headers):
+    response = client.get('/metrics/pool', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['sync']['size'] == settings.DB_POOL_SIZE
+    assert set(response.json()) == {'sync', 'async'}
+
+
+def test_pool_stats_include_replicas(monkeypatch):
+    replica = create_engine('sqlite://', poolclass=QueuePool, pool_size=2)
+    monkeypatch.setattr(database, 'replica_pool', ReplicaPool([replica], retry_after=60))
+
+    stats = database.pool_stats()
+
+    assert set(stats) == {'sync', 'async', 'replica-0'}
+    assert stats['replica-0']['size'] == 2  # noqa: PLR2004
+
+
+def test_requests_report_server_timing_and_prometheus_series(client, auth_headers):
+    response = client.get('/clients/', headers=auth_headers)
+
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('app;dur=')
+    assert 'db;dur=' in timing
+    assert 'auth;dur=' in timing
+    assert 'serialize;dur=' in timing
+
+    exposition = client.get('/metrics').text
+    assert 'luestilo_request_queries_count{method="GET",route="/clients/"}' in exposition
+    assert 'luestilo_request_duration_seconds_bucket{method="GET",route="/clients/",le="+Inf"}' in exposition
+    assert 'luestilo_pool_timeouts_total{pool="sync"} 0' in exposition
@@ -0,0 +1,234 @@
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import event
+
+from luestilo_api.models import Product
+
+
+def test_create_order_reserves_stock_for_every_item(client, session, cliente, product, auth_headers):
+    other_product = Product(
+        descricao='Calça Jeans 42',
+        valor_de_venda=129.9,
+        codigo_de_barras='7890000000001',
+        secao='Vestuário Masculino',
+        estoque_inicial=5,
+        data_validade=None,
+    )
+    session.add(other_product)
+    session.commit()
+
+    response = client.post(
+        '/orders/',
+        headers=auth_headers,
+        json={
+            'client_id': cliente.id,
+            'status': 'pendente',
+            'periodo': str(date(2025, 5, 26)),
+            'items': [
+                {'product_id': product.id, 'quantity': 2},
+                {'product_id': other_product.id, 'quantity': 5, 'price_at_order': 99.9},
+                {'product_id': product.id, 'quantity': 1},
+            ],
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json()['total_amount'] == 679.47  # noqa: PLR2004
+    assert response.json()['item_count'] == 8  # noqa: PLR2004
+    items = {item['product_id']: item for item in response.json()['products']}
+    assert items[product.id]['quantity'] == 3  # noqa: PLR2004
+    assert items[product.id]['price_at_order'] == product.valor_de_venda
+    assert items[other_product.id]['price_at_order'] == 99.9  # noqa: PLR2004
+    assert items[product.id]['product']['estoque_inicial'] == 7  # noqa: PLR2004
+    assert items[other_product.id]['product']['estoque_inicial'] == 0
+
+
+def test_create_order_with_insufficient_stock_keeps_stock(client, session, cliente, product, auth_headers):
+    response = client.post(
+        '/orders/',
+        headers=auth_headers,
+        json={
+            'client_id': cliente.id,
+            'status': 'pendente',
+            'periodo': str(date(2025, 5, 26)),
+            'items': [{'product_id': product.id, 'quantity': 11}],
+        },
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    session.refresh(product)
+    assert product.estoque_inicial == 10  # noqa: PLR2004
+
+
+def test_create_order_product_lookups_do_not_grow_with_items(client, session, cliente, auth_headers):
+    products = [
+        Product(
+            descricao=f'Produto {index}',
+            valor_de_venda=10.0,
+            codigo_de_barras=f'789000000{index:04d}',
+            secao='Acessórios',
+            estoque_inicial=10,
+            data_validade=None,
+        )
+        for index in range(20)
+    ]
+    session.add_all(products)
+    session.commit()
+
+    statements = []
+    engine = session.get_bind()
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        response = client.post(
+            '/orders/',
+            headers=auth_headers,
+            json={
+                'client_id': cliente.id,
+                'status': 'pendente',
+                'periodo': str(date(2025, 5, 26)),
+                'items': [{'product_id': product.id, 'quantity': 1} for product in products],
+            },
+        )
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert not [statement for statement in statements if statement.startswith('UPDATE products')]
+    assert len([statement for statement in statements if statement.startswith('INSERT INTO stock_movements')]) == 1
+    assert len([statement for statement in statements if statement.startswith('INSERT INTO order_products')]) == 1
+
+
+def test_read_orders_compact_view_lists_each_product_once(client, cliente, product, auth_headers):
+    for _ in range(2):
+        client.post(
+            '/orders/',
+            headers=auth_headers,
+            json={
+                'client_id': cliente.id,
+                'status': 'pendente',
+                'periodo': str(date(2025, 5, 26)),
+                'items': [{'product_id': product.id, 'quantity': 1}],
+            },
+        )
+
+    compact = client.get('/orders/?view=compact', headers=auth_headers)
+    expanded = client.get('/orders/?view=compact&include_products=true', headers=auth_headers)
+    full = client.get('/orders/', headers=auth_headers)
+
+    assert compact.status_code == HTTPStatus.OK
+    assert compact.json()['products'] is None
+    assert compact.json()['orders'][0]['products'] == [
+        {'product_id': product.id, 'quantity': 1, 'price_at_order': product.valor_de_venda}
+    ]
+    assert [item['id'] for item in expanded.json()['products']] == [product.id]
+    assert 'imagens' not in expanded.json()['products'][0]
+    assert len(compact.content) < len(full.content)
+
+
+def test_read_orders_by_section_pages_orders_not_items(client, session, cliente, product, auth_headers):
+    other_product = Product(
+        descricao='Blusa Seda P',
+        valor_de_venda=89.9,
+        codigo_de_barras='7890000000002',
+        secao='Vestuário Feminino',
+        estoque_inicial=10,
+        data_validade=None,
+    )
+    session.add(other_product)
+    session.commit()
+
+    for _ in range(3):
+        client.post(
+            '/orders/',
+            headers=auth_headers,
+            json={
+                'client_id': cliente.id,
+                'status': 'pendente',
+                'periodo': str(date(2025, 5, 26)),
+                'items': [{'product_id': product.id, 'quantity': 1}, {'product_id': other_product.id, 'quantity': 1}],
+            },
+        )
+
+    first_page = client.get('/orders/?product_section=feminino&limit=2', headers=auth_headers).json()
+    second_page = client.get(
+        f'/orders/?product_section=feminino&limit=2&after={first_page["next_cursor"]}', headers=auth_headers
+    ).json()
+
+    assert [order['id'] for order in first_page['orders']] == [1, 2]
+    assert all(len(order['products']) == 2 for order in first_page['orders'])  # noqa: PLR2004
+    assert [order['id'] for order in second_page['orders']] == [3]
+    assert second_page['next_cursor'] is None
+
+
+def test_read_orders_query_count_does_not_grow_with_page(client, session, cliente, auth_headers, query_budget):
+    products = [
+        Product(
+            descricao=f'Produto {index}',
+            valor_de_venda=10.0,
+            codigo_de_barras=f'789100000{index:04d}',
+            secao='Acessórios',
+            estoque_inicial=10,
+            data_validade=None,
+        )
+        for index in range(5)
+    ]
+    session.add_all(products)
+    session.commit()
+    for _ in range(5):
+        client.post(
+            '/orders/',
+            headers=auth_headers,
+            json={
+                'client_id': cliente.id,
+                'status': 'pendente',
+                'periodo': str(date(2025, 5, 26)),
+                'items': [{'product_id': product.id, 'quantity': 1} for product in products],
+            },
+        )
+
+    with query_budget(3):
+        response = client.get('/orders/?product_section=acessorios', headers=auth_headers)
+
+    assert len(response.json()['orders']) == 5  # noqa: PLR2004
+
+    with pytest.raises(pytest.fail.Exception, match='budget is 2'):
+        with query_budget(2):
+            client.get('/orders/', headers=auth_headers)
+
+
+def test_read_orders_sorted_by_total_without_loading_items(
+    client, session, cliente, product, auth_headers, query_budget
+):
+    for quantity in (3, 1, 2):
+        client.post(
+            '/orders/',
+            headers=auth_headers,
+            json={
+                'client_id': cliente.id,
+                'status': 'pendente',
+                'periodo': str(date(2025, 5, 26)),
+                'items': [{'product_id': product.id, 'quantity': quantity}],
+            },
+        )
+
+    with query_budget(1):
+        first_page = client.get(
+            '/orders/',
+            params={'view': 'totals', 'sort': 'total_amount', 'min_total': 100, 'limit': 1},
+            headers=auth_headers,
+        ).json()
+    second_page = client.get(
+        '/orders/',
+        params={'view': 'totals', 'sort': 'total_amount', 'min_total': 100, 'after': first_page['next_cursor']},
+        headers=auth_headers,
+    ).json()
+
+    assert [(order['id'], order['item_count']) for order in first_page['orders']] == [(3, 2)]
+    assert 'products' not in first_page['orders'][0]
+    assert [(order['id'], order['total_amount']) for order in second_page['orders']] == [(1, 179.97)]
@@ -0,0 +1,30 @@
+from http import HTTPStatus
+
+from luestilo_api.models import Client
+
+
+def test_read_clients_follows_next_cursor(client, session, auth_headers):
+    session.add_all([
+        Client(name=f'cliente {index}', email=f'cliente{index}@test.com', cpf=f'000.000.000-{index:02d}')
+        for index in range(5)
+    ])
+    session.commit()
+
+    names = []
+    params = {'limit': 2}
+    while True:
+        response = client.get('/clients/', headers=auth_headers, params=params)
+        assert response.status_code == HTTPStatus.OK
+        names.extend(client_data['name'] for client_data in response.json()['clients'])
+        if response.json()['next_cursor'] is None:
+            break
+        params = {'limit': 2, 'after': response.json()['next_cursor']}
+
+    assert names == [f'cliente {index}' for index in range(5)]
+
+
+def test_read_products_with_invalid_cursor(client, auth_headers):
+    response = client.get('/products/', headers=auth_headers, params={'after': 'not-a-cursor'})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
@@ -0,0 +1,45 @@
+import json
+from http import HTTPStatus
+
+from sqlalchemy import select
+
+from luestilo_api.models import Product
+
+
+def product_line(**overrides):
+    product = {
+        'descricao': 'Camiseta Algodão Branca M',
+        'valor_de_venda': 59.99,
+        'codigo_de_barras': '7891234567890',
+        'secao': 'Vestuário Feminino',
+        'estoque_inicial': 10,
+        'data_validade': None,
+        'imagens': None,
+    }
+    product.update(overrides)
+    return json.dumps(product)
+
+
+def test_import_products_upserts_by_barcode(client, session, product, auth_headers):
+    payload = '\n'.join([
+        product_line(),
+        product_line(codigo_de_barras='7890000000001', descricao='Calça Jeans 42'),
+        product_line(codigo_de_barras='7890000000002', valor_de_venda='caro'),
+        product_line(codigo_de_barras='7890000000001', descricao='Calça Jeans 42', estoque_inicial=3),
+        '{quebrado',
+    ])
+
+    response = client.post(
+        '/products/import',
+        headers={**auth_headers, 'Content-Type': 'application/x-ndjson'},
+        params={'chunk_size': 2},
+        content=payload,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    report = response.json()
+    assert (report['inserted'], report['updated'], report['unchanged'], report['invalid']) == (1, 1, 1, 2)
+    assert [error['line'] for error in report['errors']] == [3, 5]
+
+    jeans = session.scalar(select(Product).where(Product.codigo_de_barras == '7890000000001'))
+    assert jeans.estoque_inicial == 3  # noqa: PLR2004
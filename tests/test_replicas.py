@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from luestilo_api import database
+from luestilo_api.database import READ_PRIMARY_COOKIE, ReplicaPool
+from luestilo_api.models import Client, table_registry
+
+
+@pytest.fixture
+def replica():
+    engine = create_engine('sqlite:///:memory:', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Client(name='Replica', email='replica@test.com', cpf='529.982.247-25'))
+        session.commit()
+    return engine
+
+
+def use_replicas(monkeypatch, *engines):
+    pool = ReplicaPool(list(engines), retry_after=60)
+    monkeypatch.setattr(database, 'replica_pool', pool)
+    return pool
+
+
+def test_reads_are_routed_to_replica(client, auth_headers, cliente, replica, monkeypatch):
+    use_replicas(monkeypatch, replica)
+
+    response = client.get('/clients/', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert [item['name'] for item in response.json()['clients']] == ['Replica']
+
+
+def test_unreachable_replica_falls_back_to_primary(client, auth_headers, cliente, monkeypatch):
+    broken = create_engine('sqlite:////nonexistent/replica.db')
+    pool = use_replicas(monkeypatch, broken)
+
+    response = client.get('/clients/', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert [item['name'] for item in response.json()['clients']] == ['Teste']
+    assert pool.candidates() == []
+
+
+def test_unreachable_replica_is_skipped_for_the_next_one(client, auth_headers, cliente, replica, monkeypatch):
+    broken = create_engine('sqlite:////nonexistent/replica.db')
+    pool = use_replicas(monkeypatch, broken, replica)
+
+    response = client.get('/clients/', headers=auth_headers)
+
+    assert [item['name'] for item in response.json()['clients']] == ['Replica']
+    assert pool.candidates() == [replica]
+
+
+def test_replicas_are_used_round_robin(replica):
+    other = create_engine('sqlite://')
+    pool = ReplicaPool([replica, other], retry_after=60)
+
+    assert [pool.candidates()[0] for _ in range(3)] == [replica, other, replica]
+
+
+def test_client_reads_its_own_writes_from_primary(client, auth_headers, replica, monkeypatch):
+    use_replicas(monkeypatch, replica)
+
+    response = client.post(
+        '/clients/',
+        headers=auth_headers,
+        json={'name': 'Nova', 'email': 'nova@test.com', 'cpf': '383.625.200-78'},
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert READ_PRIMARY_COOKIE in response.cookies
+
+    response = client.get('/clients/', headers=auth_headers)
+
+    assert [item['name'] for item in response.json()['clients']] == ['Nova']
+
+
+def test_cached_product_reads_stay_on_primary(client, auth_headers, product, replica, monkeypatch):
+    use_replicas(monkeypatch, replica)
+
+    response = client.get('/products/', headers=auth_headers)
+
+    assert [item['id'] for item in response.json()['products']] == [product.id]
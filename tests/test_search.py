@@ -0,0 +1,23 @@
+from http import HTTPStatus
+
+from luestilo_api.models import Client
+
+
+def test_read_clients_name_filter_ignores_accents(client, session, auth_headers):
+    session.add_all([
+        Client(name='João Conceição', email='joao@test.com', cpf='383.625.200-78'),
+        Client(name='Maria Silva', email='maria@test.com', cpf='125.242.550-34'),
+    ])
+    session.commit()
+
+    response = client.get('/clients/', headers=auth_headers, params={'name': 'joao concei'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [client_data['name'] for client_data in response.json()['clients']] == ['João Conceição']
+
+
+def test_read_products_secao_filter_ignores_accents(client, product, auth_headers):
+    response = client.get('/products/', headers=auth_headers, params={'secao': 'VESTUARIO'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [product_data['id'] for product_data in response.json()['products']] == [product.id]